@@ -1,23 +1,43 @@
-from typing import Any, Text, Dict, List, Optional, Tuple
+from typing import Any, Callable, Text, Dict, List, Optional, Tuple
 import os
+from contextlib import contextmanager
 from pathlib import Path
+import asyncio
+import functools
+import hashlib
 import html
+import importlib
 import json
+import logging
+import math
+import multiprocessing
+import pickle
+import queue
 import re
-import urllib.error
+import shelve
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 import urllib.parse
-import urllib.request
 from datetime import datetime
+from array import array
+from types import MappingProxyType
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from rasa_sdk import Action, Tracker, FormValidationAction
 from rasa_sdk.executor import CollectingDispatcher
 from rasa_sdk.events import SlotSet, FollowupAction, ActiveLoop
 from rasa_sdk.types import DomainDict
 
+from psycopg2.extras import execute_values
+
 try:
-    from db.connection import get_connection
+    from db.connection import execute_prepared, get_connection
 except ImportError:
-    from connection import get_connection
+    from connection import execute_prepared, get_connection
 
 dspy = None
 
@@ -26,6 +46,11 @@ try:
 except Exception:
     faiss = None
 
+try:
+    import numpy as np
+except Exception:
+    np = None
+
 try:
     from sentence_transformers import SentenceTransformer
 except Exception:  
@@ -36,21 +61,206 @@ try:
 except Exception:  
     PdfReader = None
 
-RAG_SOURCES_DIR = Path(__file__).resolve().parents[1] / "rag_sources"
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import ciso8601
+except ImportError:
+    ciso8601 = None
+
+logger = logging.getLogger(__name__)
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+RAG_SOURCES_DIR = PROJECT_DIR / "rag_sources"
+RAG_CACHE_DIR = RAG_SOURCES_DIR / ".cache"
+RAG_CACHE_INDEX_FILE = RAG_CACHE_DIR / "index.faiss"
+RAG_CACHE_CHUNKS_FILE = RAG_CACHE_DIR / "chunks.pkl"
+RAG_CACHE_LOCK_FILE = RAG_CACHE_DIR / "build.lock"
+RAG_ANSWER_CACHE_FILE = RAG_CACHE_DIR / "answers"
+RAG_CACHE_FORMAT = 2            # Bump when the pickled chunk/metadata layout changes
 RAG_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+RAG_EMBEDDING_BACKEND = os.getenv("RAG_EMBEDDING_BACKEND", "torch").lower()
+RAG_EMBEDDING_ONNX_FILE = "model_qint8_avx512_vnni.onnx"  # int8 VNNI weights for CPU inference
+RAG_EMBED_MAX_BATCH = 32        # Max concurrent queries encoded in one call
+RAG_EMBED_TIMEOUT = 10.0        # Seconds to wait for a queued query embedding
+RAG_EXTRACT_TIMEOUT = 300.0     # Seconds for parallel PDF extraction before falling back to serial
 RAG_RETRIEVE_K = 15             # Wider candidate pool to avoid generic/preface chunks dominating
 RAG_CHUNK_TOKENS = 450          # Chunk size tuned for instruction-style content
 RAG_CHUNK_OVERLAP_TOKENS = 80   # Overlap prevents losing sentences at chunk boundaries
-RAG_MIN_SCORE = 0.25            # Filter low-relevance matches to reduce vague answers
+# Cosine floor for retrieved chunks. -0.5 equals the former 1/(1+L2²) >= 0.25 cut-off on unit vectors.
+RAG_MIN_SCORE = -0.5            # Filter low-relevance matches (cosine similarity) to reduce vague answers
+RAG_HNSW_M = 32                 # Graph degree for the HNSW index
+RAG_HNSW_EF_CONSTRUCTION = 200  # Build-time search depth; higher means better recall
+RAG_HNSW_EF_SEARCH = 64         # Query-time search depth; must stay above RAG_RETRIEVE_K
 RAG_REFUSE_IF_NO_EVIDENCE = True # Avoid hallucinations; require document support
 RAG_ANSWER_FORMAT = "checklist" # Stress-friendly, actionable output format
+RAG_ANSWER_CACHE_SIZE = 4096    # Max cached answers before LRU eviction
+RAG_ANSWER_CACHE_MIN_SIMILARITY = 0.95  # Cosine similarity needed to reuse a cached answer
+RAG_EXACT_CACHE_SIZE = 1024     # Max answers cached by normalized question text
+RAG_ANSWER_WORKERS = 8          # Concurrent RAG answers before requests queue
+RAG_ANSWER_TIMEOUT = 20.0       # Seconds before a turn gives up on RAG and uses the canned reply
+RAG_MIN_QUESTION_CHARS = 6      # Shorter fallback texts go straight to the canned reply
+RAG_SMALL_TALK = frozenset({
+    "ok", "okay", "yes", "no", "yep", "nope", "sure", "thanks", "thank you",
+    "hi", "hello", "help", "?", "??",
+})
+RAG_NO_EVIDENCE_ANSWER = (
+    "This question is not answered in the official documents we have. "
+    "To avoid misinformation, I can't provide an answer right now."
+)
 RAG_INDEX = None
 RAG_CHUNKS: List[str] = []
-RAG_META: List[Dict[str, Any]] = []
+RAG_META = None
 RAG_MODEL = None
+RAG_EMBEDDER = None
 DSPY_CONFIGURED = False
+RAG_DSPY_MODULE = None
 RAG_WARMUP_DONE = False
-
+RAG_LOAD_LOCK = threading.Lock()
+RAG_ANSWER_CACHE_INDEX = None
+RAG_ANSWER_CACHE: "OrderedDict[int, str]" = OrderedDict()
+RAG_ANSWER_CACHE_NEXT_ID = 0
+RAG_ANSWER_CACHE_LOCK = threading.Lock()
+RAG_EXACT_CACHE: "OrderedDict[str, str]" = OrderedDict()
+RAG_ANSWER_SHELF = None
+RAG_ANSWER_SHELF_LOCK = threading.Lock()
+RAG_INFLIGHT: Dict[str, "asyncio.Future[Optional[str]]"] = {}
+
+
+STREET_TOKENS = (
+    "strasse", "str.", "str", "street", "road",
+    "avenue", "ave", "platz", "allee", "ring", "gasse", "weg",
+)
+ADDRESS_TOKENS = (
+    "strasse", "street", "road", "rd", "avenue", "ave", "platz",
+    "allee", "ring", "gasse", "weg", "str.", "plz",
+)
+_WS_RE = re.compile(r"\s+")
+_TOKEN_RE = re.compile(r"\S+")
+_PARENS_RE = re.compile(r"\s*\(.*?\)\s*")
+_ZIP_PREFIX_RE = re.compile(r"^\d{4,5}\s+")
+_DIGIT_RE = re.compile(r"\d")
+_DIGITS_RE = re.compile(r"\d+")
+_ZIP_RE = re.compile(r"\d{4,5}")
+_ZIP_CITY_RE = re.compile(r"\b\d{4,5}\s+([^,]+)")
+_ZIP5_CITY_RE = re.compile(r"\b\d{5}\s+([A-Za-z][A-Za-z\s\-]+)")
+_STREET_RE = re.compile(
+    r"\b(" + "|".join(re.escape(token) for token in STREET_TOKENS) + r")\b",
+    re.IGNORECASE,
+)
+_COORD_RE = re.compile(r"(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)")
+_BR_RE = re.compile(r"<\s*br\s*/?>", re.IGNORECASE)
+_P_CLOSE_RE = re.compile(r"</\s*p\s*>", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]+>")
+_INLINE_WS_RE = re.compile(r"[ \t]+")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n+")
+LAT_KEYS = ("lat", "latitude")
+LON_KEYS = ("lon", "lng", "longitude")
+NESTED_LOCATION_KEYS = ("location", "coordinates", "geo")
+HTTP_USER_AGENT = "crisisbot2/1.0 (crisis assistant)"
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+HTTP_CACHE_TTLS = {
+    "api.open-meteo.com": 30 * 24 * 3600,           # Elevation never changes
+    "nominatim.openstreetmap.org": 30 * 24 * 3600,  # Geocoding and ARS lookups
+    "www.pegelonline.wsv.de": 5 * 60,               # Current gauge measurements
+    "nina.api.proxy.bund.dev": 60,                  # Official warnings, kept fresh
+    "api.brightsky.dev": 5 * 60,                    # Current weather
+}
+HTTP_CACHE_PERSISTENT_HOSTS = {"api.open-meteo.com", "nominatim.openstreetmap.org"}
+HTTP_CACHE_MAX_ENTRIES = 4096
+HTTP_CACHE_FILE = PROJECT_DIR / ".cache" / "http_cache"
+_UMLAUT_TABLE = str.maketrans(
+    {
+        "\u00e4": "a",
+        "\u00c4": "A",
+        "\u00f6": "o",
+        "\u00d6": "O",
+        "\u00fc": "u",
+        "\u00dc": "U",
+        "\u00df": "ss",
+    }
+)
+
+
+# Parses JSON from bytes or text (orjson when installed) and returns the value.
+def _json_loads(data: Any) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Serializes a value to UTF-8 JSON bytes (orjson when installed) and returns them.
+def _json_dumps_bytes(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, default=str)
+    return json.dumps(value, default=str).encode("utf-8")
+
+
+# Serializes a value to a JSON string and returns it.
+def _json_dumps(value: Any) -> str:
+    return _json_dumps_bytes(value).decode("utf-8")
+
+# Creates a pooled keep-alive session with retries and returns it.
+def _create_http_session(
+    retry_methods: Tuple[str, ...] = ("GET",),
+    headers: Optional[Dict[str, str]] = None,
+) -> requests.Session:
+    session = requests.Session()
+    retry = Retry(
+        total=2,
+        backoff_factor=0.2,
+        status_forcelist=HTTP_RETRY_STATUSES,
+        allowed_methods=frozenset(retry_methods),
+    )
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+# Shared sessions keep TLS connections to OpenAI and the public APIs alive across turns.
+_HTTP = _create_http_session(retry_methods=("POST",))
+_API_HTTP = _create_http_session(headers={"User-Agent": HTTP_USER_AGENT})
+_HTTP_CACHE: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+_HTTP_CACHE_LOCK = threading.Lock()
+_HTTP_CACHE_SHELF = None
+_HTTP_CACHE_SHELF_FAILED = False
+_HTTP_CACHE_SHELF_LOCK = threading.Lock()  # Guards the shelf so disk I/O never holds _HTTP_CACHE_LOCK
+
+# Builds a single-pass matcher for address tokens and returns it.
+def _build_address_token_matcher():
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for token in ADDRESS_TOKENS:
+            automaton.add_word(token, token)
+        automaton.make_automaton()
+        return automaton
+    return re.compile("|".join(re.escape(token) for token in ADDRESS_TOKENS))
+
+
+_ADDRESS_TOKEN_MATCHER = _build_address_token_matcher()
+
+
+# Checks lowercased text for any address token as a substring and returns True or False.
+def _has_address_token(lowered: str) -> bool:
+    if ahocorasick is not None:
+        return next(_ADDRESS_TOKEN_MATCHER.iter(lowered), None) is not None
+    return _ADDRESS_TOKEN_MATCHER.search(lowered) is not None
 
 # Loads DSPy when enabled and returns the module or None.
 def _try_import_dspy():
@@ -77,18 +287,17 @@ def _split_text(
 ) -> List[str]:
     if not text:
         return []
-    normalized = re.sub(r"\s+", " ", text).strip()
+    normalized = _WS_RE.sub(" ", text).strip()
     if not normalized:
         return []
     chunks: List[str] = []
-    tokens = normalized.split(" ")
+    # Slice chunks straight out of the normalized text using token offsets.
+    spans = [(match.start(), match.end()) for match in _TOKEN_RE.finditer(normalized)]
     start = 0
-    length = len(tokens)
+    length = len(spans)
     while start < length:
         end = min(start + chunk_tokens, length)
-        chunk = " ".join(tokens[start:end]).strip()
-        if chunk:
-            chunks.append(chunk)
+        chunks.append(normalized[spans[start][0]:spans[end - 1][1]])
         if end >= length:
             break
         start = max(end - overlap_tokens, 0)
@@ -97,55 +306,336 @@ def _split_text(
     return chunks
 
 
-# Builds the RAG index from PDFs and returns True when ready.
-def _load_rag_sources() -> bool:
-    global RAG_INDEX, RAG_CHUNKS, RAG_META, RAG_MODEL
-    if RAG_INDEX is not None:
+# Hashes the PDF list and RAG settings and returns the cache fingerprint.
+def _rag_sources_fingerprint(pdf_paths: List[Path]) -> str:
+    digest = hashlib.sha256()
+    digest.update(
+        f"{RAG_EMBEDDING_MODEL}:{RAG_CHUNK_TOKENS}:{RAG_CHUNK_OVERLAP_TOKENS}:"
+        f"binary-hnsw{RAG_HNSW_M}:format{RAG_CACHE_FORMAT}".encode("utf-8")
+    )
+    for pdf_path in pdf_paths:
+        stat = pdf_path.stat()
+        digest.update(f"\n{pdf_path.name}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+# Holds an exclusive file lock so only one worker builds the index at a time.
+@contextmanager
+def _rag_build_lock():
+    if fcntl is None:
+        yield
+        return
+    try:
+        RAG_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        handle = RAG_CACHE_LOCK_FILE.open("w")
+    except OSError:
+        yield
+        return
+    with handle:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        yield
+
+
+# Reads the persisted index when the fingerprint and embedding backend match and returns it or None.
+def _read_rag_cache(
+    fingerprint: str,
+    backend: str,
+) -> Optional[Tuple[Any, List[str], "_RagMetadata"]]:
+    if not RAG_CACHE_INDEX_FILE.exists() or not RAG_CACHE_CHUNKS_FILE.exists():
+        return None
+    try:
+        with RAG_CACHE_CHUNKS_FILE.open("rb") as handle:
+            payload = pickle.load(handle)
+        # An index built with the other backend's embeddings would not match the query vectors.
+        if payload.get("fingerprint") != fingerprint or payload.get("backend") != backend:
+            return None
+        # Map the index read-only so pages load on demand and are shared across workers.
+        io_flags = getattr(faiss, "IO_FLAG_MMAP", 0) | getattr(faiss, "IO_FLAG_READ_ONLY", 0)
+        index = faiss.read_index_binary(str(RAG_CACHE_INDEX_FILE), io_flags)
+    except Exception as exc:
+        print(f"[RAG] Cache read failed: {exc}")
+        return None
+    return index, payload["chunks"], payload["meta"]
+
+
+# Persists the index and chunk metadata atomically for the next start.
+def _write_rag_cache(
+    fingerprint: str,
+    backend: str,
+    index: Any,
+    chunks: List[str],
+    meta: "_RagMetadata",
+) -> None:
+    tmp_index = RAG_CACHE_INDEX_FILE.with_name(RAG_CACHE_INDEX_FILE.name + ".tmp")
+    tmp_chunks = RAG_CACHE_CHUNKS_FILE.with_name(RAG_CACHE_CHUNKS_FILE.name + ".tmp")
+    try:
+        RAG_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        faiss.write_index_binary(index, str(tmp_index))
+        with tmp_chunks.open("wb") as handle:
+            pickle.dump(
+                {"fingerprint": fingerprint, "backend": backend, "chunks": chunks, "meta": meta},
+                handle,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp_index, RAG_CACHE_INDEX_FILE)
+        os.replace(tmp_chunks, RAG_CACHE_CHUNKS_FILE)
+    except Exception as exc:
+        print(f"[RAG] Cache write failed: {exc}")
+
+
+class _RagMetadata:
+    """Column-oriented chunk metadata: interned source names plus per-chunk ids and pages."""
+
+    __slots__ = ("source_names", "source_ids", "pages")
+
+    # Starts with empty columns.
+    def __init__(self):
+        self.source_names: List[str] = []
+        self.source_ids = array("H")
+        self.pages = array("I")
+
+    # Appends one source's chunk pages to the columns.
+    def extend(self, source: str, pages: List[int]) -> None:
+        if not pages:
+            return
+        if not self.source_names or self.source_names[-1] != source:
+            self.source_names.append(source)
+        source_id = len(self.source_names) - 1
+        self.source_ids.extend([source_id] * len(pages))
+        self.pages.extend(pages)
+
+    # Returns the metadata dict for one chunk.
+    def __getitem__(self, idx: int) -> Dict[str, Any]:
+        return {"source": self.source_names[self.source_ids[idx]], "page": self.pages[idx]}
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+
+# Returns False for pages without font resources (e.g. image-only scans), which yield no text.
+def _page_has_text_layer(page: Any) -> bool:
+    try:
+        resources = page.get("/Resources")
+        if resources is None:
+            return False
+        resources = resources.get_object()
+        if resources.get("/Font"):
+            return True
+        # Form XObjects carry their own resources and may hold the text instead.
+        xobjects = resources.get("/XObject")
+        if not xobjects:
+            return False
+        return any(
+            xobject.get_object().get("/Subtype") == "/Form"
+            for xobject in xobjects.get_object().values()
+        )
+    except Exception:
         return True
-    if faiss is None or SentenceTransformer is None or PdfReader is None:
-        return False
-    if not RAG_SOURCES_DIR.exists():
-        return False
 
-    # Build an in-memory search index from PDF sources for fast retrieval.
+
+# Reads and chunks one PDF and returns its chunks with their page numbers.
+def _extract_pdf(pdf_path: str) -> Tuple[List[str], List[int]]:
     documents: List[str] = []
-    meta: List[Dict[str, Any]] = []
-    for pdf_path in sorted(RAG_SOURCES_DIR.glob("*.pdf")):
+    pages: List[int] = []
+    try:
+        reader = PdfReader(pdf_path)
+    except Exception:
+        return documents, pages
+    for page_index, page in enumerate(reader.pages, start=1):
+        if not _page_has_text_layer(page):
+            continue
         try:
-            reader = PdfReader(str(pdf_path))
+            text = page.extract_text() or ""
         except Exception:
-            continue
-        for page_index, page in enumerate(reader.pages, start=1):
+            text = ""
+        for chunk in _split_text(text):
+            documents.append(chunk)
+            pages.append(page_index)
+    return documents, pages
+
+
+# Cancels pending work and kills the pool's workers so a hung child cannot block exit.
+def _abandon_process_pool(executor: ProcessPoolExecutor) -> None:
+    processes = list((getattr(executor, "_processes", None) or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+
+
+# Reads and chunks all PDFs, in parallel where possible, and returns chunks with metadata.
+def _extract_rag_documents(pdf_paths: List[Path]) -> Tuple[List[str], _RagMetadata]:
+    paths = [str(pdf_path) for pdf_path in pdf_paths]
+    results = None
+    # Fork only: spawned workers would re-import this module and re-trigger the warmup.
+    if len(paths) > 1 and "fork" in multiprocessing.get_all_start_methods():
+        workers = min(len(paths), os.cpu_count() or 1)
+        executor = None
+        try:
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("fork"),
+            )
+            results = list(executor.map(_extract_pdf, paths, timeout=RAG_EXTRACT_TIMEOUT))
+            executor.shutdown(wait=True)
+        except FuturesTimeoutError:
+            print("[RAG] Parallel PDF extraction timed out, reading serially.")
+            _abandon_process_pool(executor)
+            results = None
+        except Exception as exc:
+            print(f"[RAG] Parallel PDF extraction failed, reading serially: {exc}")
+            if executor is not None:
+                _abandon_process_pool(executor)
+            results = None
+    if results is None:
+        results = [_extract_pdf(path) for path in paths]
+
+    documents: List[str] = []
+    meta = _RagMetadata()
+    for pdf_path, (pdf_documents, pdf_pages) in zip(pdf_paths, results):
+        documents.extend(pdf_documents)
+        meta.extend(pdf_path.name, pdf_pages)
+    return documents, meta
+
+
+# Packs the sign bit of each dimension into bytes and returns the binary codes.
+def _quantize_embeddings(embeddings: Any) -> Any:
+    return np.packbits((embeddings > 0).astype(np.uint8), axis=1)
+
+
+# Converts a Hamming distance between sign codes to an approximate cosine similarity.
+def _hamming_to_cosine(distance: float, bits: int) -> float:
+    return math.cos(math.pi * distance / bits)
+
+
+# Converts RAG_MIN_SCORE to the largest Hamming distance that still passes it.
+@functools.lru_cache(maxsize=4)
+def _max_rag_hamming_distance(bits: int) -> int:
+    return int(math.floor(bits * math.acos(RAG_MIN_SCORE) / math.pi))
+
+
+# Builds a binary HNSW index over the sign-quantized embeddings and returns it.
+def _build_rag_index(embeddings: Any) -> Any:
+    dimension = embeddings.shape[1]
+    index = faiss.IndexBinaryHNSW(dimension, RAG_HNSW_M)
+    index.hnsw.efConstruction = RAG_HNSW_EF_CONSTRUCTION
+    index.add(_quantize_embeddings(embeddings))
+    return index
+
+
+# Applies query-time search parameters to the index.
+def _tune_rag_index(index: Any) -> None:
+    index.hnsw.efSearch = RAG_HNSW_EF_SEARCH
+
+
+# Loads the sentence embedding model, using ONNX when requested, and returns it with the
+# backend that actually loaded.
+def _create_embedding_model() -> Tuple[Any, str]:
+    if RAG_EMBEDDING_BACKEND == "onnx":
+        try:
+            model = SentenceTransformer(
+                RAG_EMBEDDING_MODEL,
+                backend="onnx",
+                model_kwargs={"file_name": RAG_EMBEDDING_ONNX_FILE},
+            )
+            return model, "onnx"
+        except Exception as exc:
+            print(f"[RAG] ONNX backend unavailable, using torch: {exc}")
+    return SentenceTransformer(RAG_EMBEDDING_MODEL), "torch"
+
+
+class _EmbeddingBatcher:
+    """Coalesces concurrent query embeddings into batched encode calls."""
+
+    # Stores the model and starts the background encoder thread.
+    def __init__(self, model: Any, max_batch: int = RAG_EMBED_MAX_BATCH):
+        self.model = model
+        self.max_batch = max_batch
+        self.queue: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self.worker = threading.Thread(target=self._run, name="rag-embedder", daemon=True)
+        self.worker.start()
+
+    # Queues a text and returns its normalized (1, d) embedding.
+    def encode(self, text: str, timeout: float = RAG_EMBED_TIMEOUT) -> Any:
+        future: Future = Future()
+        self.queue.put((text, future))
+        return future.result(timeout=timeout)
+
+    # Drains queued texts and encodes them together until the process exits.
+    def _run(self) -> None:
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            texts = [text for text, _ in batch]
             try:
-                text = page.extract_text() or ""
-            except Exception:
-                text = ""
-            for chunk in _split_text(text):
-                documents.append(chunk)
-                meta.append(
-                    {
-                        "source": pdf_path.name,
-                        "page": page_index,
-                    }
+                embeddings = self.model.encode(
+                    texts,
+                    batch_size=len(texts),
+                    convert_to_numpy=True,
+                    normalize_embeddings=True,
                 )
+            except Exception as exc:
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+            for position, (_, future) in enumerate(batch):
+                future.set_result(embeddings[position:position + 1])
 
-    if not documents:
+
+# Builds the RAG index from PDFs (or the on-disk cache) and returns True when ready.
+def _load_rag_sources() -> bool:
+    if RAG_INDEX is not None:
+        return True
+    with RAG_LOAD_LOCK:
+        return _initialize_rag()
+
+
+# Loads or builds the index and model; callers must hold RAG_LOAD_LOCK.
+def _initialize_rag() -> bool:
+    global RAG_INDEX, RAG_CHUNKS, RAG_META, RAG_MODEL, RAG_EMBEDDER
+    if RAG_INDEX is not None:
+        return True
+    if faiss is None or np is None or SentenceTransformer is None:
+        return False
+    if not RAG_SOURCES_DIR.exists():
         return False
 
-    # Embed all chunks once and keep the FAISS index in memory.
-    RAG_MODEL = SentenceTransformer(RAG_EMBEDDING_MODEL)
-    embeddings = RAG_MODEL.encode(documents)
-    dimension = embeddings.shape[1]
-    index = faiss.IndexFlatL2(dimension)
-    index.add(embeddings)
+    pdf_paths = sorted(RAG_SOURCES_DIR.glob("*.pdf"))
+    fingerprint = _rag_sources_fingerprint(pdf_paths)
+    # Load the model first: the cache is only valid for the backend that actually loaded.
+    model, backend = _create_embedding_model()
+    with _rag_build_lock():
+        cached = _read_rag_cache(fingerprint, backend)
+        if cached is not None:
+            index, documents, meta = cached
+        else:
+            if PdfReader is None:
+                return False
+            # Build a search index from PDF sources once, then persist it for later starts.
+            documents, meta = _extract_rag_documents(pdf_paths)
+            if not documents:
+                return False
+            embeddings = model.encode(documents, batch_size=RAG_EMBED_MAX_BATCH, convert_to_numpy=True)
+            index = _build_rag_index(embeddings)
+            _write_rag_cache(fingerprint, backend, index, documents, meta)
 
+    if not documents:
+        return False
+
+    _tune_rag_index(index)
+    RAG_MODEL = model
+    RAG_EMBEDDER = _EmbeddingBatcher(RAG_MODEL)
+    _load_persisted_rag_answers(f"{fingerprint}:{backend}")
     RAG_INDEX = index
     RAG_CHUNKS = documents
     RAG_META = meta
     return True
 
 
-# Warms up the RAG index once at startup.
+# Warms up the RAG index once, in the background, at startup.
 def _warmup_rag() -> None:
     global RAG_WARMUP_DONE
     if RAG_WARMUP_DONE:
@@ -153,39 +643,174 @@ def _warmup_rag() -> None:
     enable = os.getenv("RAG_WARMUP", "true").lower() in ("1", "true", "yes")
     if not enable:
         return
+    # Blocks until this module has finished importing; forking the PDF workers mid-import
+    # would leave the children waiting on an import lock owned by a thread they lack.
+    importlib.import_module(__name__)
     try:
         print("[RAG] started.")
-        _load_rag_sources()
+        if _load_rag_sources():
+            # Pay the first-call encode and search setup costs here, not on the first user turn.
+            query_embedding = _embed_rag_query("warmup")
+            if query_embedding is not None:
+                try:
+                    RAG_INDEX.search(_quantize_embeddings(query_embedding), RAG_RETRIEVE_K)
+                except Exception as exc:
+                    print(f"[RAG] Warmup search failed: {exc}")
     finally:
         RAG_WARMUP_DONE = True
         print("[RAG] finished.")
 
 
-_warmup_rag()
+threading.Thread(target=_warmup_rag, name="rag-warmup", daemon=True).start()
 
 
-# Finds relevant chunks for a question and returns chunks with metadata.
-def _retrieve_rag_context(question: str) -> Tuple[List[str], List[Dict[str, Any]]]:
+# Embeds a question for cosine search and returns the vector or None.
+def _embed_rag_query(question: str) -> Any:
     if not question:
-        return [], []
+        return None
     if not _load_rag_sources():
+        return None
+    try:
+        return RAG_EMBEDDER.encode(question)
+    except Exception as exc:
+        print(f"[RAG] Query embedding failed: {exc}")
+        return None
+
+
+# Finds relevant chunks for a question and returns chunks with metadata.
+def _retrieve_rag_context(
+    question: str,
+    query_embedding: Any = None,
+) -> Tuple[List[str], List[Dict[str, Any]]]:
+    if query_embedding is None:
+        query_embedding = _embed_rag_query(question)
+    if query_embedding is None:
         return [], []
-    # Use vector search to fetch top-k relevant chunks for the user query.
-    query_embedding = RAG_MODEL.encode([question])
-    distances, indices = RAG_INDEX.search(query_embedding, RAG_RETRIEVE_K)
+    # Use Hamming search over sign codes to fetch top-k relevant chunks for the user query.
+    distances, indices = RAG_INDEX.search(_quantize_embeddings(query_embedding), RAG_RETRIEVE_K)
+    # The score threshold is applied as an integer radius on the raw distances.
+    keep = (indices[0] >= 0) & (distances[0] <= _max_rag_hamming_distance(RAG_INDEX.d))
     contexts: List[str] = []
     sources: List[Dict[str, Any]] = []
-    for distance, idx in zip(distances[0], indices[0]):
-        if idx < 0 or idx >= len(RAG_CHUNKS):
-            continue
-        score = 1.0 / (1.0 + float(distance))
-        if score < RAG_MIN_SCORE:
-            continue
+    for distance, idx in zip(distances[0][keep].tolist(), indices[0][keep].tolist()):
         contexts.append(RAG_CHUNKS[idx])
-        sources.append({**RAG_META[idx], "score": score})
+        sources.append({**RAG_META[idx], "score": _hamming_to_cosine(distance, RAG_INDEX.d)})
     return contexts, sources
 
 
+# Returns a cached answer for a near-identical earlier question, or None.
+def _lookup_rag_answer_cache(query_embedding: Any) -> Optional[str]:
+    if query_embedding is None:
+        return None
+    with RAG_ANSWER_CACHE_LOCK:
+        if RAG_ANSWER_CACHE_INDEX is None or not RAG_ANSWER_CACHE:
+            return None
+        similarities, ids = RAG_ANSWER_CACHE_INDEX.search(query_embedding, 1)
+        cache_id = int(ids[0][0])
+        if cache_id < 0 or float(similarities[0][0]) < RAG_ANSWER_CACHE_MIN_SIMILARITY:
+            return None
+        answer = RAG_ANSWER_CACHE.get(cache_id)
+        if answer is not None:
+            RAG_ANSWER_CACHE.move_to_end(cache_id)
+        return answer
+
+
+# Stores an answer under its question embedding, evicting the oldest entry when full.
+def _store_rag_answer_cache(query_embedding: Any, answer: str) -> None:
+    global RAG_ANSWER_CACHE_INDEX, RAG_ANSWER_CACHE_NEXT_ID
+    if query_embedding is None or not answer or np is None:
+        return
+    with RAG_ANSWER_CACHE_LOCK:
+        if RAG_ANSWER_CACHE_INDEX is None:
+            RAG_ANSWER_CACHE_INDEX = faiss.IndexIDMap2(faiss.IndexFlatIP(query_embedding.shape[1]))
+        if len(RAG_ANSWER_CACHE) >= RAG_ANSWER_CACHE_SIZE:
+            evicted_id, _ = RAG_ANSWER_CACHE.popitem(last=False)
+            RAG_ANSWER_CACHE_INDEX.remove_ids(np.array([evicted_id], dtype="int64"))
+        cache_id = RAG_ANSWER_CACHE_NEXT_ID
+        RAG_ANSWER_CACHE_NEXT_ID += 1
+        RAG_ANSWER_CACHE_INDEX.add_with_ids(query_embedding, np.array([cache_id], dtype="int64"))
+        RAG_ANSWER_CACHE[cache_id] = answer
+
+
+# Opens the on-disk answer cache, discarding it when the sources changed, and fills the in-memory caches.
+def _load_persisted_rag_answers(fingerprint: str) -> None:
+    global RAG_ANSWER_SHELF
+    try:
+        RAG_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        shelf = shelve.open(str(RAG_ANSWER_CACHE_FILE))
+    except Exception as exc:
+        print(f"[RAG] Answer cache unavailable: {exc}")
+        return
+    with RAG_ANSWER_SHELF_LOCK:
+        if shelf.get("__fingerprint__") != fingerprint:
+            # Answers were grounded in the old documents; start over.
+            shelf.clear()
+            shelf["__fingerprint__"] = fingerprint
+        entries = sorted(
+            (value for key, value in shelf.items() if key != "__fingerprint__"),
+            key=lambda entry: entry[0],
+        )
+        if len(entries) > RAG_ANSWER_CACHE_SIZE:
+            # Keep the newest answers on disk, matching the in-memory LRU bound.
+            stale, entries = entries[:-RAG_ANSWER_CACHE_SIZE], entries[-RAG_ANSWER_CACHE_SIZE:]
+            for _, question_key, _, _ in stale:
+                shelf.pop(question_key, None)
+        shelf.sync()
+        RAG_ANSWER_SHELF = shelf
+    for _, question_key, query_embedding, answer in entries:
+        _store_rag_answer_cache(query_embedding, answer)
+        _store_exact_rag_answer(question_key, answer)
+    if entries:
+        print(f"[RAG] Restored {len(entries)} cached answers.")
+
+
+# Writes a generated answer to the on-disk cache so it survives restarts.
+def _persist_rag_answer(question_key: str, query_embedding: Any, answer: str) -> None:
+    if RAG_ANSWER_SHELF is None or not question_key or query_embedding is None or not answer:
+        return
+    try:
+        with RAG_ANSWER_SHELF_LOCK:
+            RAG_ANSWER_SHELF[question_key] = (time.time(), question_key, query_embedding, answer)
+            RAG_ANSWER_SHELF.sync()
+    except Exception as exc:
+        print(f"[RAG] Answer cache write failed: {exc}")
+
+
+# Returns True when text could be a real question worth a RAG lookup.
+def _is_rag_worthy(text: str) -> bool:
+    text = text.strip()
+    return (
+        len(text) >= RAG_MIN_QUESTION_CHARS
+        and text.lower() not in RAG_SMALL_TALK
+        and any(char.isalpha() for char in text)
+    )
+
+
+# Normalizes case and whitespace and returns the exact-cache key for a question.
+def _rag_question_key(question: str) -> str:
+    return " ".join(question.lower().split()) if question else ""
+
+
+# Returns the answer cached for this exact (normalized) question, or None.
+def _lookup_exact_rag_answer(question_key: str) -> Optional[str]:
+    with RAG_ANSWER_CACHE_LOCK:
+        answer = RAG_EXACT_CACHE.get(question_key)
+        if answer is not None:
+            RAG_EXACT_CACHE.move_to_end(question_key)
+        return answer
+
+
+# Stores an answer under its normalized question, evicting the oldest entry when full.
+def _store_exact_rag_answer(question_key: str, answer: str) -> None:
+    if not question_key or not answer:
+        return
+    with RAG_ANSWER_CACHE_LOCK:
+        RAG_EXACT_CACHE[question_key] = answer
+        RAG_EXACT_CACHE.move_to_end(question_key)
+        while len(RAG_EXACT_CACHE) > RAG_EXACT_CACHE_SIZE:
+            RAG_EXACT_CACHE.popitem(last=False)
+
+
 class _OpenAIChatLLM:
     # Stores the API key and model name for later calls.
     def __init__(self, api_key: str, model: str, temperature: float = 0.1, max_tokens: int = 250):
@@ -220,17 +845,17 @@ class _OpenAIChatLLM:
                 {"role": "user", "content": prompt},
             ],
         }
-        response = requests.post(
+        response = _HTTP.post(
             "https://api.openai.com/v1/chat/completions",
             headers={
                 "Authorization": f"Bearer {self.api_key}",
                 "Content-Type": "application/json",
             },
-            json=payload,
+            data=_json_dumps_bytes(payload),
             timeout=15,
         )
         response.raise_for_status()
-        data = response.json()
+        data = _json_loads(response.content)
         return data["choices"][0]["message"]["content"].strip()
 
     def __call__(self, prompt: str, **kwargs) -> str:
@@ -248,7 +873,7 @@ def _get_openai_llm() -> Optional[_OpenAIChatLLM]:
 
 # Configures DSPy with the OpenAI client and returns the client.
 def _configure_dspy() -> Optional[_OpenAIChatLLM]:
-    global DSPY_CONFIGURED
+    global DSPY_CONFIGURED, RAG_DSPY_MODULE
     dspy_module = _try_import_dspy()
     if dspy_module is None:
         return None
@@ -258,19 +883,54 @@ def _configure_dspy() -> Optional[_OpenAIChatLLM]:
     if lm is None:
         return None
     dspy_module.settings.configure(lm=lm)
+    try:
+        RAG_DSPY_MODULE = _build_rag_dspy_module(dspy_module)
+    except Exception as exc:
+        print(f"[RAG] DSPy module setup failed, using OpenAI directly: {exc}")
     DSPY_CONFIGURED = True
     return lm
 
 
+# Defines the DSPy RAG signature and module once and returns a module instance.
+def _build_rag_dspy_module(dspy_module):
+    class RagAnswer(dspy_module.Signature):
+        """Answer using the provided context."""
+
+        question: str
+        context: str
+        answer: str
+
+    class RagModule(dspy_module.Module):
+        # Sets up the DSPy predictor for this module.
+        def __init__(self):
+            super().__init__()
+            self.generate = dspy_module.Predict(RagAnswer)
+
+        # Runs the predictor and returns its output.
+        def forward(self, question: str, context: str):
+            return self.generate(question=question, context=context)
+
+    return RagModule()
+
+
 # Answers with RAG (and DSPy when available) and returns the text or None.
 def _rag_dspy_answer(question: str) -> Optional[str]:
-    contexts, sources = _retrieve_rag_context(question)
+    # Literal repeats ("help", "what now?") skip even the query embedding.
+    question_key = _rag_question_key(question)
+    cached_answer = _lookup_exact_rag_answer(question_key)
+    if cached_answer is not None:
+        return cached_answer
+
+    query_embedding = _embed_rag_query(question)
+    cached_answer = _lookup_rag_answer_cache(query_embedding)
+    if cached_answer is not None:
+        _store_exact_rag_answer(question_key, cached_answer)
+        return cached_answer
+
+    contexts, sources = _retrieve_rag_context(question, query_embedding)
     if not contexts:
         if RAG_REFUSE_IF_NO_EVIDENCE:
-            return (
-                "This question is not answered in the official documents we have. "
-                "To avoid misinformation, I can't provide an answer right now."
-            )
+            return RAG_NO_EVIDENCE_ANSWER
         return None
 
     context_text = "\n\n".join(contexts)
@@ -286,33 +946,14 @@ def _rag_dspy_answer(question: str) -> Optional[str]:
     if lm is None:
         return None
 
-    dspy_module = _try_import_dspy()
-    if dspy_module is not None and _configure_dspy() is not None:
+    if _configure_dspy() is not None and RAG_DSPY_MODULE is not None:
         try:
-            class RagAnswer(dspy_module.Signature):
-                """Answer using the provided context."""
-
-                question: str
-                context: str
-                answer: str
-
-            class RagModule(dspy_module.Module):
-                # Sets up the DSPy predictor for this module.
-                def __init__(self):
-                    super().__init__()
-                    self.generate = dspy_module.Predict(RagAnswer)
-
-                # Runs the predictor and returns its output.
-                def forward(self, question: str, context: str):
-                    return self.generate(question=question, context=context)
-
-            module = RagModule()
             question_text = (
                 f"{question}\nFormat: {RAG_ANSWER_FORMAT}"
                 if format_hint
                 else question
             )
-            result = module(question=question_text, context=context_text)
+            result = RAG_DSPY_MODULE(question=question_text, context=context_text)
             answer = str(result.answer).strip() if result and getattr(result, "answer", None) else ""
         except Exception as exc:
             print(f"[RAG] DSPy failed, falling back to OpenAI: {exc}")
@@ -324,45 +965,58 @@ def _rag_dspy_answer(question: str) -> Optional[str]:
         return None
     normalized = answer.lower().strip()
     if normalized in {"i do not know.", "i do not know", "i don't know.", "i don't know"}:
-        return (
-            "This question is not answered in the official documents we have. "
-            "To avoid misinformation, I can't provide an answer right now."
-        )
+        answer = RAG_NO_EVIDENCE_ANSWER
+    _store_rag_answer_cache(query_embedding, answer)
+    _store_exact_rag_answer(question_key, answer)
+    _persist_rag_answer(question_key, query_embedding, answer)
     return answer
 
+
+_RAG_ANSWER_EXECUTOR = ThreadPoolExecutor(max_workers=RAG_ANSWER_WORKERS, thread_name_prefix="rag-answer")
+
+
+# Answers on the RAG worker pool so the action server keeps serving; returns None on timeout.
+async def _rag_dspy_answer_async(question: str) -> Optional[str]:
+    # Identical questions already in flight share one answer instead of each paying for retrieval and the LLM.
+    question_key = _rag_question_key(question)
+    future = RAG_INFLIGHT.get(question_key)
+    if future is None:
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(_RAG_ANSWER_EXECUTOR, _rag_dspy_answer, question)
+        RAG_INFLIGHT[question_key] = future
+        future.add_done_callback(lambda _: RAG_INFLIGHT.pop(question_key, None))
+    try:
+        # Shielded so one caller timing out does not cancel the answer for the others.
+        return await asyncio.wait_for(asyncio.shield(future), RAG_ANSWER_TIMEOUT)
+    except asyncio.TimeoutError:
+        print(f"[RAG] Answer timed out after {RAG_ANSWER_TIMEOUT:.0f}s; using fallback reply.")
+        return None
+
+
 # Normalizes a city name and returns the cleaned value.
 def _normalize_city_name(city: Optional[str]) -> Optional[str]:
     if not city:
         return None
-    clean = re.sub(r"\s*\(.*?\)\s*", "", str(city)).strip()
-    replacements = {
-        "\u00e4": "a",
-        "\u00c4": "A",
-        "\u00f6": "o",
-        "\u00d6": "O",
-        "\u00fc": "u",
-        "\u00dc": "U",
-        "\u00df": "ss",
-    }
-    for src, dst in replacements.items():
-        clean = clean.replace(src, dst)
-    clean = re.sub(r"\s+", " ", clean).strip()
-    return clean
+    return _normalize_city_text(str(city))
 
 
-# Pulls possible city names from a location string and returns a list.
-def _extract_city_candidates(location_text: str) -> List[str]:
+# Memoized core of _normalize_city_name for string input.
+@functools.lru_cache(maxsize=1024)
+def _normalize_city_text(city: str) -> str:
+    clean = _PARENS_RE.sub("", city).strip().translate(_UMLAUT_TABLE)
+    return _WS_RE.sub(" ", clean).strip()
+
+
+# Pulls possible city names from a location string and returns a tuple.
+@functools.lru_cache(maxsize=1024)
+def _extract_city_candidates(location_text: str) -> Tuple[str, ...]:
     if not location_text:
-        return []
+        return ()
     text = str(location_text).strip()
     if not text:
-        return []
+        return ()
 
     country_tokens = {"germany", "deutschland", "de"}
-    street_tokens = (
-        "strasse", "str.", "str", "street", "road",
-        "avenue", "ave", "platz", "allee", "ring", "gasse", "weg",
-    )
 
     candidates: List[str] = []
     parts = [p.strip() for p in text.split(",") if p.strip()]
@@ -370,23 +1024,23 @@ def _extract_city_candidates(location_text: str) -> List[str]:
         for part in reversed(parts):
             if part.lower() in country_tokens:
                 continue
-            part = re.sub(r"^\d{4,5}\s+", "", part)
+            part = _ZIP_PREFIX_RE.sub("", part)
             part = part.strip()
             if not part:
                 continue
-            if re.search(r"\d", part):
-                if re.search(r"\b(" + "|".join(street_tokens) + r")\b", part, re.IGNORECASE):
+            if _DIGIT_RE.search(part):
+                if _STREET_RE.search(part):
                     continue
-                part = re.sub(r"\d+", "", part).strip()
+                part = _DIGITS_RE.sub("", part).strip()
             if part:
                 candidates.append(part)
 
     if not candidates:
-        match = re.search(r"\b\d{4,5}\s+([^,]+)", text)
+        match = _ZIP_CITY_RE.search(text)
         if match:
             candidates.append(match.group(1).strip())
 
-    return candidates
+    return tuple(candidates)
 
 
 # Checks if the text looks like a location and returns True or False.
@@ -418,14 +1072,9 @@ def _looks_like_location_text(text: str) -> bool:
     lat, lon = _extract_lat_lon(cleaned, None)
     if lat is not None and lon is not None:
         return True
-    address_tokens = (
-        "strasse", "street", "road", "rd", "avenue", "ave", "platz",
-        "allee", "ring", "gasse", "weg", "str.", "plz",
-    )
-    has_address_token = any(token in lowered for token in address_tokens)
-    if has_address_token:
+    if _has_address_token(lowered):
         return True
-    if re.search(r"\d{4,5}", cleaned):
+    if _ZIP_RE.search(cleaned):
         return True
     candidates = _extract_city_candidates(cleaned)
     if candidates and len(cleaned.split()) <= 4:
@@ -440,7 +1089,19 @@ def _looks_like_location_text(text: str) -> bool:
 def _build_city_variants(city: Optional[str]) -> List[str]:
     if not city:
         return []
+    if isinstance(city, str):
+        return list(_city_variants(city))
+    return list(_compute_city_variants(city))
+
+
+# Memoized city variants for string locations, shared by the warnings/numbers/supply actions.
+@functools.lru_cache(maxsize=1024)
+def _city_variants(city: str) -> Tuple[str, ...]:
+    return _compute_city_variants(city)
 
+
+# Computes normalized city variants and returns them in priority order.
+def _compute_city_variants(city: Any) -> Tuple[str, ...]:
     candidates: List[str] = []
     if isinstance(city, str):
         candidates.extend(_extract_city_candidates(city))
@@ -465,7 +1126,7 @@ def _build_city_variants(city: Optional[str]) -> List[str]:
                 continue
             seen.add(key)
             variants.append(value)
-    return variants
+    return tuple(variants)
 
 
 # Picks a display-friendly city label and returns it.
@@ -477,6 +1138,18 @@ def _pick_display_city(candidates: List[str]) -> Optional[str]:
 
 
 
+SUPPLY_CATEGORY_ALIASES = MappingProxyType({
+    "food": "food",
+    "water": "water",
+    "baby_food": "baby_food",
+    "baby food": "baby_food",
+    "babyfood": "baby_food",
+    "hygiene_kit": "hygiene_kit",
+    "hygiene kit": "hygiene_kit",
+    "accommodation": "accommodation",
+})
+
+
 # Normalizes supply categories and returns the mapped value.
 def _normalize_supply_category(value: Any) -> Optional[str]:
     if value is None:
@@ -485,19 +1158,7 @@ def _normalize_supply_category(value: Any) -> Optional[str]:
         value = value[0] if value else None
     if not value:
         return None
-    text = str(value).strip().lower()
-    mapping = {
-        "food": "food",
-        "water": "water",
-        "baby_food": "baby_food",
-        "baby food": "baby_food",
-        "babyfood": "baby_food",
-        "hygiene_kit": "hygiene_kit",
-        "hygiene kit": "hygiene_kit",
-        "accommodation": "accommodation",
-    }
-    normalized = mapping.get(text)
-    return normalized
+    return SUPPLY_CATEGORY_ALIASES.get(str(value).strip().lower())
 
 
 def _parse_float(value: Any) -> Optional[float]:
@@ -516,29 +1177,26 @@ def _is_valid_lat_lon(lat: Optional[float], lon: Optional[float]) -> bool:
     return -90.0 <= lat <= 90.0 and -180.0 <= lon <= 180.0
 
 
-# Reads lat/lon from a dict and returns a tuple.
+# Reads lat/lon from a dict (or its nested location dicts) and returns a tuple.
 def _get_lat_lon_from_dict(data: Optional[Dict[str, Any]]) -> Tuple[Optional[float], Optional[float]]:
-    if not isinstance(data, dict):
-        return None, None
-    lat = data.get("lat")
-    lon = data.get("lon")
-    if lat is None:
-        lat = data.get("latitude")
-    if lon is None:
-        lon = data.get("lng")
-    if lon is None:
-        lon = data.get("longitude")
-    lat_f = _parse_float(lat)
-    lon_f = _parse_float(lon)
-    if _is_valid_lat_lon(lat_f, lon_f):
-        return lat_f, lon_f
-
-    for key in ("location", "coordinates", "geo"):
-        nested = data.get(key)
-        lat_f, lon_f = _get_lat_lon_from_dict(nested)
-        if _is_valid_lat_lon(lat_f, lon_f):
+    stack = [data]
+    while stack:
+        current = stack.pop()
+        if not isinstance(current, dict):
+            continue
+        lat = next((current[key] for key in LAT_KEYS if current.get(key) is not None), None)
+        lon = next((current[key] for key in LON_KEYS if current.get(key) is not None), None)
+        lat_f = _parse_float(lat)
+        lon_f = _parse_float(lon)
+        if (
+            lat_f is not None
+            and lon_f is not None
+            and -90.0 <= lat_f <= 90.0
+            and -180.0 <= lon_f <= 180.0
+        ):
             return lat_f, lon_f
-
+        # Push in reverse so nested keys are searched in NESTED_LOCATION_KEYS order.
+        stack.extend(current.get(key) for key in reversed(NESTED_LOCATION_KEYS))
     return None, None
 
 
@@ -557,14 +1215,14 @@ def _extract_lat_lon(location_value: Any, metadata: Optional[Dict[str, Any]]) ->
         text = location_value.strip()
         if text.startswith("{") and text.endswith("}"):
             try:
-                parsed = json.loads(text)
+                parsed = _json_loads(text)
                 lat, lon = _get_lat_lon_from_dict(parsed)
                 if lat is not None and lon is not None:
                     return lat, lon
             except json.JSONDecodeError:
                 pass
 
-        match = re.search(r"(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)", text)
+        match = _COORD_RE.search(text)
         if match:
             lat = _parse_float(match.group(1))
             lon = _parse_float(match.group(2))
@@ -574,15 +1232,131 @@ def _extract_lat_lon(location_value: Any, metadata: Optional[Dict[str, Any]]) ->
     return None, None
 
 
+# Drops expired entries and the oldest overflow from the on-disk cache.
+def _prune_http_cache_shelf(shelf) -> None:
+    now = time.time()
+    live = []
+    for key in list(shelf.keys()):
+        try:
+            stored_at, _ = shelf[key]
+        except Exception:
+            stored_at = None
+        ttl = HTTP_CACHE_TTLS.get(urllib.parse.urlsplit(key).hostname)
+        if stored_at is None or not ttl or now - stored_at >= ttl:
+            del shelf[key]
+        else:
+            live.append((stored_at, key))
+    live.sort()
+    for _, key in live[: max(0, len(live) - HTTP_CACHE_MAX_ENTRIES)]:
+        del shelf[key]
+    shelf.sync()
+
+
+# Opens (and prunes) the on-disk cache for static endpoints and returns it or None.
+# Callers must hold _HTTP_CACHE_SHELF_LOCK.
+def _get_http_cache_shelf():
+    global _HTTP_CACHE_SHELF, _HTTP_CACHE_SHELF_FAILED
+    if _HTTP_CACHE_SHELF is None and not _HTTP_CACHE_SHELF_FAILED:
+        try:
+            HTTP_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            _HTTP_CACHE_SHELF = shelve.open(str(HTTP_CACHE_FILE))
+            _prune_http_cache_shelf(_HTTP_CACHE_SHELF)
+        except Exception as exc:
+            print(f"[HTTP] Disk cache unavailable: {exc}")
+            _HTTP_CACHE_SHELF = None
+            _HTTP_CACHE_SHELF_FAILED = True
+    return _HTTP_CACHE_SHELF
+
+
+# Runs fn(shelf) under the shelf lock and returns its result, or None without a shelf.
+def _with_http_cache_shelf(fn: Callable[[Any], Any]) -> Any:
+    with _HTTP_CACHE_SHELF_LOCK:
+        shelf = _get_http_cache_shelf()
+        if shelf is None:
+            return None
+        return fn(shelf)
+
+
+# Removes keys from the on-disk cache.
+def _drop_from_http_cache_shelf(keys: List[str]) -> None:
+    def drop(shelf) -> None:
+        for key in keys:
+            shelf.pop(key, None)
+        shelf.sync()
+
+    _with_http_cache_shelf(drop)
+
+
+# Returns a fresh cached payload for the key, or None.
+def _http_cache_get(key: str, ttl: int, persistent: bool) -> Any:
+    now = time.time()
+    with _HTTP_CACHE_LOCK:
+        entry = _HTTP_CACHE.get(key)
+    if entry is None and persistent:
+        entry = _with_http_cache_shelf(lambda shelf: shelf.get(key))
+    if entry is None:
+        return None
+    stored_at, payload = entry
+    if now - stored_at >= ttl:
+        with _HTTP_CACHE_LOCK:
+            _HTTP_CACHE.pop(key, None)
+        if persistent:
+            _drop_from_http_cache_shelf([key])
+        return None
+    with _HTTP_CACHE_LOCK:
+        _HTTP_CACHE[key] = entry
+        _HTTP_CACHE.move_to_end(key)
+    return payload
+
+
+# Stores a payload under the key, evicting the oldest entry (in memory and on disk) when full.
+def _http_cache_put(key: str, payload: Any, persistent: bool) -> None:
+    entry = (time.time(), payload)
+    evicted = []
+    with _HTTP_CACHE_LOCK:
+        _HTTP_CACHE[key] = entry
+        _HTTP_CACHE.move_to_end(key)
+        while len(_HTTP_CACHE) > HTTP_CACHE_MAX_ENTRIES:
+            evicted.append(_HTTP_CACHE.popitem(last=False)[0])
+    # Keys leaving the memory LRU leave the shelf too, so it stays within a bounded size.
+    evicted = [
+        old for old in evicted
+        if urllib.parse.urlsplit(old).hostname in HTTP_CACHE_PERSISTENT_HOSTS
+    ]
+    if not persistent:
+        if evicted:
+            _drop_from_http_cache_shelf(evicted)
+        return
+
+    def store(shelf) -> None:
+        shelf[key] = entry
+        for old in evicted:
+            shelf.pop(old, None)
+        shelf.sync()
+
+    _with_http_cache_shelf(store)
+
+
+# Fetches JSON from a URL (served from the TTL cache when fresh) and returns it or None.
 def _fetch_json(url: str, headers: Optional[Dict[str, str]] = None,
                 timeout: int = 8) -> Optional[Dict[str, Any]]:
-    req = urllib.request.Request(url, headers=headers or {})
+    host = urllib.parse.urlsplit(url).hostname
+    ttl = HTTP_CACHE_TTLS.get(host)
+    persistent = host in HTTP_CACHE_PERSISTENT_HOSTS
+    key = url + json.dumps(headers, sort_keys=True) if headers else url
+    if ttl:
+        cached = _http_cache_get(key, ttl, persistent)
+        if cached is not None:
+            return cached
     try:
-        with urllib.request.urlopen(req, timeout=timeout) as resp:
-            data = resp.read().decode("utf-8")
-        return json.loads(data)
-    except (urllib.error.URLError, json.JSONDecodeError, TimeoutError):
+        response = _API_HTTP.get(url, headers=headers, timeout=timeout)
+        response.raise_for_status()
+        data = _json_loads(response.content)
+    except (requests.RequestException, ValueError):
         return None
+    if ttl and data is not None:
+        _http_cache_put(key, data, persistent)
+    return data
 
 
 # Normalizes spacing and returns the cleaned text.
@@ -590,7 +1364,7 @@ def _clean_text(value: Optional[str]) -> Optional[str]:
     if not value:
         return None
     text = str(value).replace("\r", " ").replace("\n", " ").strip()
-    return re.sub(r"\s+", " ", text).strip() or None
+    return _WS_RE.sub(" ", text).strip() or None
 
 
 # Strips HTML and returns clean text.
@@ -598,12 +1372,12 @@ def _clean_html_text(value: Optional[str]) -> Optional[str]:
     if not value:
         return None
     text = html.unescape(str(value))
-    text = re.sub(r"<\s*br\s*/?>", "\n", text, flags=re.IGNORECASE)
-    text = re.sub(r"</\s*p\s*>", "\n", text, flags=re.IGNORECASE)
-    text = re.sub(r"<[^>]+>", "", text)
+    text = _BR_RE.sub("\n", text)
+    text = _P_CLOSE_RE.sub("\n", text)
+    text = _TAG_RE.sub("", text)
     text = text.replace("\r", "\n")
-    text = re.sub(r"[ \t]+", " ", text)
-    text = re.sub(r"\n\s*\n+", "\n\n", text)
+    text = _INLINE_WS_RE.sub(" ", text)
+    text = _BLANK_LINES_RE.sub("\n\n", text)
     return text.strip() or None
 
 
@@ -611,35 +1385,51 @@ def _clean_html_text(value: Optional[str]) -> Optional[str]:
 def extract_city(address: str) -> Optional[str]:
     if not address:
         return None
-    match = re.search(r"\b\d{5}\s+([A-Za-z][A-Za-z\s\-]+)", address)
+    match = _ZIP5_CITY_RE.search(address)
     return match.group(1).strip() if match else None
 
 
+class _LookupUnavailable(Exception):
+    """Raised inside cached lookups so transient failures are not memoized."""
+
+
 # Looks up an ARS code for an address and returns it.
 def _get_ars_code(address: str) -> Optional[str]:
     if not address:
         return None
 
-    address = extract_city(address)
-    if not address:
+    city = extract_city(address)
+    if not city:
         return None
 
+    # Nominatim matching is case-insensitive, so spellings of one city share a cache entry.
+    try:
+        return _lookup_ars_code(" ".join(city.split()).lower())
+    except _LookupUnavailable:
+        return None
+
+
+# Queries Nominatim for a city's regional key and returns it (cached per city).
+@functools.lru_cache(maxsize=2048)
+def _lookup_ars_code(city: str) -> Optional[str]:
     params = {
-        "q": address,
+        "q": city,
         "format": "jsonv2",
         "addressdetails": 1,
         "extratags": 1,
         "limit": 1,
     }
     url = "https://nominatim.openstreetmap.org/search?" + urllib.parse.urlencode(params)
-    headers = {"User-Agent": "crisisbot2/1.0 (official warnings lookup)"}
-    data = _fetch_json(url, headers=headers)
+    data = _fetch_json(url)
+    if data is None:
+        raise _LookupUnavailable(city)
     if not data or not isinstance(data, list):
         return None
     first = data[0] or {}
     extratags = first.get("extratags") or {}
     return extratags.get("de:regionalschluessel")
 
+
 # Pulls a warning id from a payload and returns it.
 def _extract_warning_id(payload: Any) -> Optional[str]:
     items = None
@@ -673,6 +1463,15 @@ def _select_warning_info(payload: Any) -> Optional[Dict[str, Any]]:
 def _geocode_city(location_text: str) -> Tuple[Optional[float], Optional[float], Optional[str]]:
     if not location_text:
         return None, None, None
+    try:
+        return _lookup_city_coordinates(location_text)
+    except _LookupUnavailable:
+        return None, None, None
+
+
+# Queries Nominatim for coordinates and returns them (cached per text).
+@functools.lru_cache(maxsize=512)
+def _lookup_city_coordinates(location_text: str) -> Tuple[Optional[float], Optional[float], Optional[str]]:
     params = {
         "format": "json",
         "limit": 1,
@@ -680,8 +1479,9 @@ def _geocode_city(location_text: str) -> Tuple[Optional[float], Optional[float],
         "countrycodes": "de",
     }
     url = "https://nominatim.openstreetmap.org/search?" + urllib.parse.urlencode(params)
-    headers = {"User-Agent": "crisisbot2/1.0 (weather lookup)"}
-    data = _fetch_json(url, headers=headers)
+    data = _fetch_json(url)
+    if data is None:
+        raise _LookupUnavailable(location_text)
     if not data or not isinstance(data, list):
         return None, None, None
     first = data[0]
@@ -698,15 +1498,23 @@ def _format_timestamp(value: Any) -> Optional[str]:
     if not value:
         return None
     if isinstance(value, str):
-        cleaned = value.replace("Z", "+00:00")
-        try:
-            parsed = datetime.fromisoformat(cleaned)
-            return parsed.strftime("%Y-%m-%d %H:%M UTC")
-        except ValueError:
+        parsed = _parse_iso_datetime(value)
+        if parsed is None:
             return value
+        return parsed.strftime("%Y-%m-%d %H:%M UTC")
     return None
 
 
+# Parses an ISO 8601 timestamp (including a trailing Z) and returns a datetime or None.
+def _parse_iso_datetime(value: str) -> Optional[datetime]:
+    try:
+        if ciso8601 is not None:
+            return ciso8601.parse_datetime(value)
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
 # Gets nearby Pegelonline stations and returns a list.
 def _fetch_pegel_stations(lat: float, lon: float, radius_km: int = 5) -> List[Dict[str, Any]]:
     params = {
@@ -729,7 +1537,8 @@ def _fetch_pegel_stations(lat: float, lon: float, radius_km: int = 5) -> List[Di
 
 # Gets elevation for coordinates and returns the value or None.
 def _fetch_elevation(lat: float, lon: float) -> Optional[float]:
-    params = {"latitude": lat, "longitude": lon}
+    # ~10 m precision is finer than the elevation model and lets nearby points share cache entries.
+    params = {"latitude": round(lat, 4), "longitude": round(lon, 4)}
     url = "https://api.open-meteo.com/v1/elevation?" + urllib.parse.urlencode(params)
     data = _fetch_json(url)
     if not isinstance(data, dict):
@@ -756,52 +1565,100 @@ def _build_handoff_summary(tracker: Tracker, max_messages: int = 10) -> str:
     if lat is not None and lon is not None:
         slots["lat"] = lat
         slots["lon"] = lon
-    messages: List[Dict[str, str]] = []
-    for event in reversed(tracker.events or []):
-        event_type = event.get("event")
-        if event_type == "user":
-            text = event.get("text")
-            if text:
-                messages.append({"sender": "user", "text": text})
-        elif event_type == "bot":
-            text = event.get("text")
-            if text:
-                messages.append({"sender": "bot", "text": text})
+    # Walk back from the newest event and stop once enough messages are collected.
+    messages: "deque[Dict[str, str]]" = deque(maxlen=max_messages)
+    for event in reversed(tracker.events or ()):
         if len(messages) >= max_messages:
             break
-    messages.reverse()
-    summary = {"slots": slots, "last_messages": messages}
-    return json.dumps(summary, default=str)
-
-
-# Finds an open or assigned handoff request and returns its id.
-def _get_active_handoff_request(cur, conversation_id: str) -> Optional[int]:
-    cur.execute(
-        """
+        event_type = event.get("event")
+        if event_type not in ("user", "bot"):
+            continue
+        text = event.get("text")
+        if text:
+            messages.appendleft({"sender": event_type, "text": text})
+    summary = {"slots": slots, "last_messages": list(messages)}
+    return _json_dumps(summary)
+
+
+ACTIVE_HANDOFF_SQL = """
+    SELECT id
+    FROM handoff_requests
+    WHERE conversation_id = $1 AND status IN ('open', 'assigned')
+    ORDER BY created_at DESC
+    LIMIT 1
+"""
+INSERT_HANDOFF_MESSAGE_SQL = """
+    INSERT INTO handoff_messages (request_id, sender, text)
+    VALUES ($1, $2, $3)
+    RETURNING id
+"""
+# Updates the active handoff (or opens one) and posts the system message in one statement.
+ESCALATE_HANDOFF_SQL = """
+    WITH active AS (
         SELECT id
         FROM handoff_requests
-        WHERE conversation_id = %s AND status IN ('open', 'assigned')
+        WHERE conversation_id = $1 AND status IN ('open', 'assigned')
         ORDER BY created_at DESC
         LIMIT 1
-        """,
-        (conversation_id,),
+    ), updated AS (
+        UPDATE handoff_requests h
+        SET risk_score = $2::integer,
+            crisis_type = $3::crisis_type,
+            user_status = $4::text,
+            user_channel = $5::text,
+            summary_json = $6::jsonb
+        FROM active
+        WHERE h.id = active.id
+        RETURNING h.id
+    ), inserted AS (
+        INSERT INTO handoff_requests
+          (conversation_id, status, risk_score, crisis_type, user_status,
+           user_channel, summary_json)
+        SELECT $1::text, 'open', $2::integer, $3::crisis_type, $4::text, $5::text, $6::jsonb
+        WHERE NOT EXISTS (SELECT 1 FROM active)
+        RETURNING id
     )
+    INSERT INTO handoff_messages (request_id, sender, text)
+    SELECT id, 'system', $7::text FROM updated
+    UNION ALL
+    SELECT id, 'system', $7::text FROM inserted
+    RETURNING request_id, id
+"""
+
+
+# Finds an open or assigned handoff request and returns its id.
+def _get_active_handoff_request(cur, conversation_id: str) -> Optional[int]:
+    execute_prepared(cur, "crisos_active_handoff", ACTIVE_HANDOFF_SQL, (conversation_id,))
     row = cur.fetchone()
     return row[0] if row else None
 
 
 # Inserts a handoff message and returns the new id.
 def _insert_handoff_message(cur, request_id: int, sender: str, text: str) -> Optional[int]:
-    cur.execute(
-        """
-        INSERT INTO handoff_messages (request_id, sender, text)
-        VALUES (%s, %s, %s)
-        RETURNING id
-        """,
-        (request_id, sender, text),
+    ids = _insert_handoff_messages(cur, request_id, [(sender, text)])
+    return ids[0] if ids else None
+
+
+# Inserts (sender, text) messages in one round trip and returns the new ids.
+def _insert_handoff_messages(cur, request_id: int, rows: List[Tuple[str, str]]) -> List[int]:
+    if not rows:
+        return []
+    if len(rows) == 1:
+        sender, text = rows[0]
+        execute_prepared(
+            cur,
+            "crisos_insert_handoff_message",
+            INSERT_HANDOFF_MESSAGE_SQL,
+            (request_id, sender, text),
+        )
+        return [row[0] for row in cur.fetchall()]
+    inserted = execute_values(
+        cur,
+        "INSERT INTO handoff_messages (request_id, sender, text) VALUES %s RETURNING id",
+        [(request_id, sender, text) for sender, text in rows],
+        fetch=True,
     )
-    row = cur.fetchone()
-    return row[0] if row else None
+    return [row[0] for row in inserted]
 
 class ActionSetUserStatus(Action):
     """Detect and set user status based on intent"""
@@ -883,8 +1740,186 @@ class ActionDetectCrisisType(Action):
         
         return []
 
+# Risk scoring tables shared by the assessment actions.
+MEDICAL_SCORES = MappingProxyType({
+    "none": 0,
+    "medications": 25,
+    "injured": 45,
+    "critical": 70,
+})
+WATER_LEVEL_SCORES = MappingProxyType({
+    "below_10cm": 5,
+    "10cm_30cm": 15,
+    "30cm_60cm": 30,
+    "above_60cm": 45,
+})
+WATER_TREND_SCORES = MappingProxyType({
+    "none": 0,
+    "stable": 0,
+    "slowly_rising": 15,
+    "rising_fast": 25,
+})
+FLOOR_INFO_SCORES = MappingProxyType({
+    "basement": 25,
+    "ground": 15,
+    "upper_floor": 0,
+})
+HAZARD_SCORES = MappingProxyType({
+    "none": 0,
+    "gas_smell": 25,
+    "electricity_risk": 25,
+    "fire": 30,
+})
+FIRE_DISTANCE_SCORES = MappingProxyType({
+    "none": 0,
+    "visible": 10,
+    "nearby": 20,
+    "surrounding": 45,
+})
+SMOKE_SCORES = MappingProxyType({
+    "none": 0,
+    "slightly_difficult": 15,
+    "cant_breathe": 45,
+})
+TEMPERATURE_RISK_SCORES = MappingProxyType({
+    "normal": 0,
+    "uncomfortable": 25,
+    "dangerous": 35,
+})
+BUILDING_FLOOR_SCORES = MappingProxyType({
+    "ground_1st": 0,
+    "2_4": 10,
+    "5_plus": 15,
+})
+DURATION_SCORES = MappingProxyType({
+    "below_6hours": 5,
+    "6h_24h": 15,
+    "above_24h": 30,
+})
+PERSON_COUNT_SCORES = MappingProxyType({
+    1: 0,
+    2: 10,
+    3: 10,
+    4: 15,
+    5: 15,
+    6: 15,
+})
+PERSON_COUNT_DEFAULT_SCORE = 20  # 7+ people
+
+
+# Parses the person_count slot and returns the count, or None when missing or not a number.
+def _parse_person_count(person_count: Any) -> Optional[int]:
+    if not person_count:
+        return None
+    try:
+        return int(person_count)
+    except (TypeError, ValueError):
+        return None
+
+
+# Scores the person_count slot and returns 0 when it is missing or not a number.
+def _person_count_score(person_count: Any) -> int:
+    count = _parse_person_count(person_count)
+    if count is None:
+        return 0
+    return PERSON_COUNT_SCORES.get(count, PERSON_COUNT_DEFAULT_SCORE)
+
+
+# Slots that feed the risk score, in _compute_risk argument order.
+RISK_SLOTS = (
+    "need_medical",
+    "person_count",
+    "vulnerable_group",
+    "mobility_needs",
+    "crisis_type",
+    "water_level",
+    "water_trend",
+    "floor_info",
+    "power_outage",
+    "hazard_type",
+    "fire_distance",
+    "smoke_inhalation",
+    "vehicle_access",
+    "heating_cooling_risk",
+    "building_floor",
+    "duration_estimate",
+)
+
+
+# Computes the risk score from RISK_SLOTS values and returns it (memoized per slot combination).
+@functools.lru_cache(maxsize=1024)
+def _compute_risk(
+    need_medical: Any,
+    person_count: Any,
+    vulnerable_group: Any,
+    mobility_needs: Any,
+    crisis_type: Any,
+    water_level: Any,
+    water_trend: Any,
+    floor_info: Any,
+    power_outage: Any,
+    hazard_type: Any,
+    fire_distance: Any,
+    smoke_inhalation: Any,
+    vehicle_access: Any,
+    heating_cooling_risk: Any,
+    building_floor: Any,
+    duration_estimate: Any,
+) -> int:
+    # Medical status (0-70) and person count (0-20).
+    risk_score = MEDICAL_SCORES.get(need_medical, 0)
+    risk_score += _person_count_score(person_count)
+
+    # Vulnerable groups (0-20) and mobility needs (0-10).
+    if vulnerable_group == "yes":
+        risk_score += 20
+    if mobility_needs == "yes":
+        risk_score += 10
+
+    if crisis_type == "flood":
+        risk_score += WATER_LEVEL_SCORES.get(water_level, 0)
+        risk_score += WATER_TREND_SCORES.get(water_trend, 0)
+        risk_score += FLOOR_INFO_SCORES.get(floor_info, 0)
+        if power_outage == "yes":
+            risk_score += 20
+        risk_score += HAZARD_SCORES.get(hazard_type, 0)
+
+    elif crisis_type == "wildfire":
+        risk_score += FIRE_DISTANCE_SCORES.get(fire_distance, 0)
+        risk_score += SMOKE_SCORES.get(smoke_inhalation, 0)
+        if vehicle_access == "no_vehicle":
+            risk_score += 20
+
+    elif crisis_type == "power_outage":
+        risk_score += TEMPERATURE_RISK_SCORES.get(heating_cooling_risk, 0)
+        risk_score += BUILDING_FLOOR_SCORES.get(building_floor, 0)
+        risk_score += DURATION_SCORES.get(duration_estimate, 0)
+
+    return risk_score
+
+
+# Reads RISK_SLOTS from the tracker and returns the risk score.
+def _calculate_risk_score(tracker: Tracker) -> int:
+    values = tuple(tracker.get_slot(slot) for slot in RISK_SLOTS)
+    try:
+        return _compute_risk(*values)
+    except TypeError:
+        # Unhashable slot values (e.g. lists) bypass the memo.
+        return _compute_risk.__wrapped__(*values)
+
+
+# (minimum score, risk level, response, escalate) checked from highest to lowest.
+RISK_LEVELS = (
+    (70, "high", "utter_high_risk_handover", True),
+    (45, "medium", "utter_medium_risk_info", True),
+    (0, "low", "utter_low_risk_info", False),
+)
+
+
 class ActionCalculateRiskScore(Action):
     """Calculate risk score based on all collected information"""
+
+    ESCALATE = FollowupAction("action_escalate_to_operator")
     
     def name(self) -> Text:
         return "action_calculate_risk_score"
@@ -894,201 +1929,20 @@ class ActionCalculateRiskScore(Action):
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
-        risk_score = 0
-        
-        # Medical status (0-70).
-        need_medical = tracker.get_slot("need_medical")
-        medical_scores = {
-            "none": 0,
-            "medications": 25,
-            "injured": 45,
-            "critical": 70
-        }
-        risk_score += medical_scores.get(need_medical, 0)
-        
-        # Person count (0-20).
-        person_count = tracker.get_slot("person_count")
-        if person_count:
-            try:
-                count = int(person_count)
-                if count == 1:
-                    risk_score += 0
-                elif count in [2, 3]:
-                    risk_score += 10
-                elif count in [4, 5, 6]:
-                    risk_score += 15
-                else:  # 7+
-                    risk_score += 20
-            except:
-                pass
-        
-        # Vulnerable groups (0-20).
-        vulnerable = tracker.get_slot("vulnerable_group")
-        if vulnerable == "yes":
-            risk_score += 20
-        
-        # Mobility needs (0-10).
-        mobility = tracker.get_slot("mobility_needs")
-        if mobility == "yes":
-            risk_score += 10
-        
-        crisis_type = tracker.get_slot("crisis_type")
-        
-        if crisis_type == "flood":
-            risk_score += self._calculate_flood_risk(tracker)
-        
-        elif crisis_type == "wildfire":
-            risk_score += self._calculate_wildfire_risk(tracker)
-        
-        elif crisis_type == "power_outage":
-            risk_score += self._calculate_outage_risk(tracker)
-        
-        if risk_score >= 70:
-            risk_level = "high"
-        elif risk_score >= 45:
-            risk_level = "medium"
-        else:
-            risk_level = "low"
+        risk_score = _calculate_risk_score(tracker)
         
         # Escalate for medium/high risk; otherwise provide guidance.
-        if risk_level == "high":
-            dispatcher.utter_message(response="utter_high_risk_handover")
-            return [
-                SlotSet("risk_score", risk_score),
-                SlotSet("risk_level", risk_level),
-                FollowupAction("action_escalate_to_operator")
-            ]
-        
-        elif risk_level == "medium":
-            dispatcher.utter_message(response="utter_medium_risk_info")
-            return [
-                SlotSet("risk_score", risk_score),
-                SlotSet("risk_level", risk_level),
-                FollowupAction("action_escalate_to_operator")
-            ]
-        
-        else:
-            dispatcher.utter_message(response="utter_low_risk_info")
-            return [
-                SlotSet("risk_score", risk_score),
-                SlotSet("risk_level", risk_level)
-            ]
-    
-    # Calculates flood risk and returns the score.
-    def _calculate_flood_risk(self, tracker: Tracker) -> int:
-        """Calculate flood-specific risk"""
-        score = 0
-        
-        # Water level (0-45).
-        water_level = tracker.get_slot("water_level")
-        water_scores = {
-            "below_10cm": 5,
-            "10cm_30cm": 15,
-            "30cm_60cm": 30,
-            "above_60cm": 45
-        }
-        score += water_scores.get(water_level, 0)
-        
-        # Water trend (0-25).
-        water_trend = tracker.get_slot("water_trend")
-        trend_scores = {
-            "none": 0,
-            "stable": 0,
-            "slowly_rising": 15,
-            "rising_fast": 25
-        }
-        score += trend_scores.get(water_trend, 0)
-        
-        # Floor info (0-25).
-        floor_info = tracker.get_slot("floor_info")
-        floor_scores = {
-            "basement": 25,
-            "ground": 15,
-            "upper_floor": 0
-        }
-        score += floor_scores.get(floor_info, 0)
-        
-        # Power outage (0-20).
-        power_outage = tracker.get_slot("power_outage")
-        if power_outage == "yes":
-            score += 20
-        
-        # Hazard type (0-30).
-        hazard = tracker.get_slot("hazard_type")
-        hazard_scores = {
-            "none": 0,
-            "gas_smell": 25,
-            "electricity_risk": 25,
-            "fire": 30
-        }
-        score += hazard_scores.get(hazard, 0)
-        
-        return score
-    
-    # Calculates wildfire risk and returns the score.
-    def _calculate_wildfire_risk(self, tracker: Tracker) -> int:
-        """Calculate wildfire-specific risk"""
-        score = 0
-        
-        # Fire distance (0-45).
-        fire_distance = tracker.get_slot("fire_distance")
-        distance_scores = {
-            "none": 0,
-            "visible": 10,
-            "nearby": 20,
-            "surrounding": 45
-        }
-        score += distance_scores.get(fire_distance, 0)
-        
-        # Smoke inhalation (0-45).
-        smoke = tracker.get_slot("smoke_inhalation")
-        smoke_scores = {
-            "none": 0,
-            "slightly_difficult": 15,
-            "cant_breathe": 45
-        }
-        score += smoke_scores.get(smoke, 0)
-        
-        # Vehicle access (0-20).
-        vehicle = tracker.get_slot("vehicle_access")
-        if vehicle == "no_vehicle":
-            score += 20
-        
-        return score
-    
-    # Calculates outage risk and returns the score.
-    def _calculate_outage_risk(self, tracker: Tracker) -> int:
-        """Calculate power outage-specific risk"""
-        score = 0
-        
-        # Heating/cooling risk (0-35).
-        temp_risk = tracker.get_slot("heating_cooling_risk")
-        temp_scores = {
-            "normal": 0,
-            "uncomfortable": 25,
-            "dangerous": 35
-        }
-        score += temp_scores.get(temp_risk, 0)
-        
-        # Building floor (0-15).
-        floor = tracker.get_slot("building_floor")
-        floor_scores = {
-            "ground_1st": 0,
-            "2_4": 10,
-            "5_plus": 15
-        }
-        score += floor_scores.get(floor, 0)
-        
-        # Duration (0-30).
-        duration = tracker.get_slot("duration_estimate")
-        duration_scores = {
-            "below_6hours": 5,
-            "6h_24h": 15,
-            "above_24h": 30
-        }
-        score += duration_scores.get(duration, 0)
-        
-        return score
+        for threshold, risk_level, response, escalate in RISK_LEVELS:
+            if risk_score >= threshold:
+                break
+        dispatcher.utter_message(response=response)
+        events = [
+            SlotSet("risk_score", risk_score),
+            SlotSet("risk_level", risk_level),
+        ]
+        if escalate:
+            events.append(self.ESCALATE)
+        return events
 
 
 class ValidateEmergencyAssessmentForm(FormValidationAction):
@@ -1143,22 +1997,21 @@ class ValidateTrappedAssessmentForm(FormValidationAction):
         tracker: Tracker,
         domain: DomainDict,
     ) -> List[Text]:
+        # Critical medical need alone reaches the handover threshold; skip the full scorer.
+        if tracker.get_slot("need_medical") == "critical":
+            return []
         required = ["location", "need_medical", "person_count"]
         current_risk = self._calculate_current_risk(tracker)
         if current_risk >= 70:
             return []
 
-        person_count = tracker.get_slot("person_count")
-        if person_count:
-            try:
-                if int(person_count) > 1:
-                    required.append("vulnerable_group")
+        person_count = _parse_person_count(tracker.get_slot("person_count"))
+        if person_count is not None and person_count > 1:
+            required.append("vulnerable_group")
 
-                    vulnerable = tracker.get_slot("vulnerable_group")
-                    if vulnerable == "yes":
-                        required.append("mobility_needs")
-            except Exception:
-                pass
+            vulnerable = tracker.get_slot("vulnerable_group")
+            if vulnerable == "yes":
+                required.append("mobility_needs")
 
         crisis_type = tracker.get_slot("crisis_type")
         if not crisis_type:
@@ -1237,115 +2090,7 @@ class ValidateTrappedAssessmentForm(FormValidationAction):
     # Estimates risk from current slots and returns the score.
     def _calculate_current_risk(self, tracker: Tracker) -> int:
         """Best-effort risk calculation using currently filled slots."""
-        risk_score = 0
-
-        need_medical = tracker.get_slot("need_medical")
-        medical_scores = {
-            "none": 0,
-            "medications": 25,
-            "injured": 45,
-            "critical": 70,
-        }
-        risk_score += medical_scores.get(need_medical, 0)
-
-        person_count = tracker.get_slot("person_count")
-        if person_count:
-            try:
-                count = int(str(person_count))
-                if count == 1:
-                    risk_score += 0
-                elif count in [2, 3]:
-                    risk_score += 10
-                elif count in [4, 5, 6]:
-                    risk_score += 15
-                else:
-                    risk_score += 20
-            except Exception:
-                pass
-
-        if tracker.get_slot("vulnerable_group") == "yes":
-            risk_score += 20
-
-        if tracker.get_slot("mobility_needs") == "yes":
-            risk_score += 10
-
-        crisis_type = tracker.get_slot("crisis_type")
-        if crisis_type == "flood":
-            water_level = tracker.get_slot("water_level")
-            risk_score += {
-                "below_10cm": 5,
-                "10cm_30cm": 15,
-                "30cm_60cm": 30,
-                "above_60cm": 45,
-            }.get(water_level, 0)
-
-            water_trend = tracker.get_slot("water_trend")
-            risk_score += {
-                "none": 0,
-                "stable": 0,
-                "slowly_rising": 15,
-                "rising_fast": 25,
-            }.get(water_trend, 0)
-
-            floor_info = tracker.get_slot("floor_info")
-            risk_score += {
-                "basement": 25,
-                "ground": 15,
-                "upper_floor": 0,
-            }.get(floor_info, 0)
-
-            if tracker.get_slot("power_outage") == "yes":
-                risk_score += 20
-            hazard_type = tracker.get_slot("hazard_type")
-            risk_score += {
-                "none": 0,
-                "gas_smell": 25,
-                "electricity_risk": 25,
-                "fire": 30,
-            }.get(hazard_type, 0)
-
-        elif crisis_type == "wildfire":
-            fire_distance = tracker.get_slot("fire_distance")
-            risk_score += {
-                "none": 0,
-                "visible": 10,
-                "nearby": 20,
-                "surrounding": 45,
-            }.get(fire_distance, 0)
-
-            smoke_inhalation = tracker.get_slot("smoke_inhalation")
-            risk_score += {
-                "none": 0,
-                "slightly_difficult": 15,
-                "cant_breathe": 45,
-            }.get(smoke_inhalation, 0)
-
-            if tracker.get_slot("vehicle_access") == "no_vehicle":
-                risk_score += 20
-
-        elif crisis_type == "power_outage":
-            heating_cooling_risk = tracker.get_slot("heating_cooling_risk")
-            risk_score += {
-                "normal": 0,
-                "uncomfortable": 25,
-                "dangerous": 35,
-            }.get(heating_cooling_risk, 0)
-
-            building_floor = tracker.get_slot("building_floor")
-            risk_score += {
-                "ground_1st": 0,
-                "2_4": 10,
-                "5_plus": 15,
-            }.get(building_floor, 0)
-
-            duration_estimate = tracker.get_slot("duration_estimate")
-            risk_score += {
-                "below_6hours": 5,
-                "6h_24h": 15,
-                "above_24h": 30,
-            }.get(duration_estimate, 0)
-
-        return int(risk_score)
+        return _calculate_risk_score(tracker)
 
 
 class ValidateSafeInfoForm(FormValidationAction):
@@ -1400,7 +2145,7 @@ class ActionProvideWarnings(Action):
         return "action_provide_warnings"
 
     # Fetches official warnings and returns events.
-    def run(self, dispatcher: CollectingDispatcher,
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         location = tracker.get_slot("location")
@@ -1410,7 +2155,7 @@ class ActionProvideWarnings(Action):
 
         city_candidates = _build_city_variants(location)
         city_label = _pick_display_city(city_candidates) if city_candidates else _clean_text(location)
-        ars_code = _get_ars_code(str(location))
+        ars_code = await asyncio.to_thread(_get_ars_code, str(location))
 
         header = "OFFICIAL WARNINGS"
         if city_label:
@@ -1423,9 +2168,9 @@ class ActionProvideWarnings(Action):
             return []
 
         dashboard_url = f"https://nina.api.proxy.bund.dev/api31/dashboard/{ars_code}.json"
-        print(f"[Warnings] Dashboard URL: {dashboard_url}")
-        dashboard = _fetch_json(dashboard_url)
-        print(f"[Warnings] Dashboard result: {dashboard}")
+        logger.debug("[Warnings] Dashboard URL: %s", dashboard_url)
+        dashboard = await asyncio.to_thread(_fetch_json, dashboard_url)
+        logger.debug("[Warnings] Dashboard result: %s", dashboard)
         warning_id = _extract_warning_id(dashboard)
         if not warning_id:
             dispatcher.utter_message(
@@ -1434,9 +2179,9 @@ class ActionProvideWarnings(Action):
             return []
 
         warning_url = f"https://nina.api.proxy.bund.dev/api31/warnings/{warning_id}.json"
-        print(f"[Warnings] Warning URL: {warning_url}")
-        warning_payload = _fetch_json(warning_url)
-        print(f"[Warnings] Warning result: {warning_payload}")
+        logger.debug("[Warnings] Warning URL: %s", warning_url)
+        warning_payload = await asyncio.to_thread(_fetch_json, warning_url)
+        logger.debug("[Warnings] Warning result: %s", warning_payload)
         info = _select_warning_info(warning_payload)
         if not info:
             dispatcher.utter_message(
@@ -1464,6 +2209,101 @@ class ActionProvideWarnings(Action):
         return []
 
 
+NATIONAL_EMERGENCY_NUMBERS_SQL = """
+    SELECT label, phone
+    FROM emergency_numbers
+    WHERE scope = 'national'
+    ORDER BY label
+"""
+# Ranks rows by the position of their city in the candidate list (first parameter).
+CITY_CANDIDATES_CTE = """
+    WITH candidates AS (
+        SELECT lower(candidate) AS city_key, position
+        FROM unnest($1::text[]) WITH ORDINALITY AS c(candidate, position)
+    )
+"""
+CITY_EMERGENCY_NUMBERS_SQL = CITY_CANDIDATES_CTE + """
+    SELECT e.label, e.phone, e.city_name, c.position
+    FROM emergency_numbers e
+    JOIN candidates c ON lower(e.city_name) = c.city_key
+    WHERE e.scope = 'city'
+    ORDER BY c.position, e.label
+"""
+CITY_SUPPLY_POINTS_SQL = CITY_CANDIDATES_CTE + """
+    SELECT s.name, s.address, s.description, s.phone, s.city_name, c.position
+    FROM supply_points s
+    JOIN candidates c ON lower(s.city_name) = c.city_key
+    WHERE s.category = $2
+    ORDER BY c.position, s.name
+"""
+CITY_CONTACT_POINTS_SQL = CITY_CANDIDATES_CTE + """
+    SELECT p.name, p.address, p.description, p.phone, p.city_name, c.position
+    FROM contact_points p
+    JOIN candidates c ON lower(p.city_name) = c.city_key
+    ORDER BY c.position, p.name
+"""
+
+
+# Queries all city candidates at once and returns the rows of the first candidate that matched.
+def _fetch_first_city_match(
+    cur,
+    statement_name: str,
+    statement: str,
+    city_candidates: List[str],
+    params: Tuple[Any, ...] = (),
+) -> Tuple[List[Tuple[Any, ...]], Optional[str]]:
+    if not city_candidates:
+        return [], None
+    execute_prepared(cur, statement_name, statement, (list(city_candidates), *params))
+    rows = cur.fetchall()
+    if not rows:
+        return [], None
+    position = rows[0][-1]
+    matched = [row[:-1] for row in rows if row[-1] == position]
+    return matched, city_candidates[position - 1]
+
+
+DB_LOOKUP_TTL = 30             # Seconds reference-data lookups are reused; admin edits show after this
+DB_LOOKUP_MAX_ENTRIES = 1024
+_DB_LOOKUP_CACHE: "OrderedDict[Tuple[Any, ...], Tuple[float, Any]]" = OrderedDict()
+_DB_LOOKUP_LOCK = threading.Lock()
+
+
+# Returns the result stored for key within DB_LOOKUP_TTL, otherwise loads, stores and returns it.
+def _cached_db_lookup(key: Tuple[Any, ...], load: Callable[[], Any]) -> Any:
+    now = time.monotonic()
+    with _DB_LOOKUP_LOCK:
+        entry = _DB_LOOKUP_CACHE.get(key)
+        if entry is not None and now - entry[0] < DB_LOOKUP_TTL:
+            _DB_LOOKUP_CACHE.move_to_end(key)
+            return entry[1]
+    result = load()
+    with _DB_LOOKUP_LOCK:
+        _DB_LOOKUP_CACHE[key] = (now, result)
+        _DB_LOOKUP_CACHE.move_to_end(key)
+        while len(_DB_LOOKUP_CACHE) > DB_LOOKUP_MAX_ENTRIES:
+            _DB_LOOKUP_CACHE.popitem(last=False)
+    return result
+
+
+# Looks up rows for the first matching city candidate on a pooled connection and returns them.
+def _lookup_city_rows(
+    statement_name: str,
+    statement: str,
+    city_candidates: List[str],
+    params: Tuple[Any, ...] = (),
+) -> Tuple[List[Tuple[Any, ...]], Optional[str]]:
+    if not city_candidates:
+        return [], None
+
+    def load() -> Tuple[List[Tuple[Any, ...]], Optional[str]]:
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                return _fetch_first_city_match(cur, statement_name, statement, city_candidates, params)
+
+    return _cached_db_lookup((statement_name, tuple(city_candidates), *params), load)
+
+
 class ActionProvideEmergencyNumbers(Action):
     """Provide emergency numbers from the database"""
 
@@ -1471,42 +2311,16 @@ class ActionProvideEmergencyNumbers(Action):
         return "action_provide_emergency_numbers"
 
     # Fetches emergency numbers and returns events.
-    def run(self, dispatcher: CollectingDispatcher,
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         location = tracker.get_slot("location")
 
-        with get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    SELECT label, phone
-                    FROM emergency_numbers
-                    WHERE scope = 'national'
-                    ORDER BY label
-                    """
-                )
-                national = cur.fetchall()
-
-                city_numbers = []
-                city_label = None
-                if location:
-                    city_candidates = _build_city_variants(location)
-                    for candidate in city_candidates:
-                        cur.execute(
-                            """
-                            SELECT label, phone, city_name
-                            FROM emergency_numbers
-                            WHERE scope = 'city' AND lower(city_name) = lower(%s)
-                            ORDER BY label
-                            """,
-                            (candidate,),
-                        )
-                        rows = cur.fetchall()
-                        if rows:
-                            city_numbers = [(row[0], row[1]) for row in rows]
-                            city_label = rows[0][2] or _pick_display_city([candidate])
-                            break
+        # National and city lookups are independent; run them on separate pooled connections.
+        national, (city_numbers, city_label) = await asyncio.gather(
+            asyncio.to_thread(self._fetch_national_numbers),
+            asyncio.to_thread(self._fetch_city_numbers, location),
+        )
 
         if not national and not city_numbers:
             dispatcher.utter_message(text="EMERGENCY NUMBERS\n\nNo numbers are available.")
@@ -1525,6 +2339,29 @@ class ActionProvideEmergencyNumbers(Action):
 
         return []
 
+    # Loads national emergency numbers and returns (label, phone) rows.
+    @staticmethod
+    def _fetch_national_numbers() -> List[Tuple[Any, ...]]:
+        def load() -> List[Tuple[Any, ...]]:
+            with get_connection() as conn:
+                with conn.cursor() as cur:
+                    execute_prepared(cur, "emerg_national", NATIONAL_EMERGENCY_NUMBERS_SQL, ())
+                    return cur.fetchall()
+
+        return _cached_db_lookup(("emerg_national",), load)
+
+    # Loads numbers for the first matching city variant and returns them with the city label.
+    @staticmethod
+    def _fetch_city_numbers(location: Any) -> Tuple[List[Tuple[Any, Any]], Optional[str]]:
+        if not location:
+            return [], None
+        rows, candidate = _lookup_city_rows(
+            "emerg_city", CITY_EMERGENCY_NUMBERS_SQL, _build_city_variants(location)
+        )
+        if not rows:
+            return [], None
+        return [(row[0], row[1]) for row in rows], rows[0][2] or _pick_display_city([candidate])
+
 
 class ActionProvideForecast(Action):
     """Provide current weather information"""
@@ -1533,7 +2370,7 @@ class ActionProvideForecast(Action):
         return "action_provide_forecast"
 
     # Fetches the weather forecast and returns events.
-    def run(self, dispatcher: CollectingDispatcher,
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         location = tracker.get_slot("location")
@@ -1547,10 +2384,10 @@ class ActionProvideForecast(Action):
         display_name = None
 
         if lat is None or lon is None:
-            print("[Location] No coordinates provided. Using Nominatim lookup.")
-            lat, lon, display_name = _geocode_city(str(location))
+            logger.debug("[Location] No coordinates provided. Using Nominatim lookup.")
+            lat, lon, display_name = await asyncio.to_thread(_geocode_city, str(location))
         else:
-            print(f"[Location] Using provided coordinates: lat={lat}, lon={lon}")
+            logger.debug("[Location] Using provided coordinates: lat=%s, lon=%s", lat, lon)
 
         if lat is None or lon is None:
             dispatcher.utter_message(
@@ -1560,8 +2397,8 @@ class ActionProvideForecast(Action):
 
         params = {"lat": lat, "lon": lon}
         url = "https://api.brightsky.dev/current_weather?" + urllib.parse.urlencode(params)
-        data = _fetch_json(url)
-        print("[Forecast] BrightSky response:", data)
+        data = await asyncio.to_thread(_fetch_json, url)
+        logger.debug("[Forecast] BrightSky response: %s", data)
 
         if not data:
             dispatcher.utter_message(
@@ -1590,15 +2427,14 @@ class ActionProvideForecast(Action):
         updated_raw = weather.get("timestamp") or weather.get("time")
         updated_at = None
         if isinstance(updated_raw, str):
-            cleaned = updated_raw.replace("Z", "+00:00")
-            try:
-                parsed = datetime.fromisoformat(cleaned)
+            parsed = _parse_iso_datetime(updated_raw)
+            if parsed is not None:
                 time_12h = parsed.strftime("%I:%M %p").lstrip("0")
                 updated_at = (
                     f"{parsed.strftime('%Y-%m-%d %H:%M')} "
                     f"({time_12h})"
                 )
-            except ValueError:
+            else:
                 updated_at = _format_timestamp(updated_raw)
         else:
             updated_at = _format_timestamp(updated_raw)
@@ -1618,6 +2454,23 @@ class ActionProvideForecast(Action):
         return []
 
 
+# Formats one supply/contact point row as a numbered block and returns it.
+def _format_point(idx: int, row: Tuple[Any, ...]) -> str:
+    name, address, description, phone, _ = row
+    text = f"{idx}. {name}\n   Address: {address}"
+    if description:
+        text += f"\n   Details: {description}"
+    if phone:
+        text += f"\n   Phone: {phone}"
+    return text
+
+
+# Formats a header and point rows into one message and returns it.
+def _format_points(header: str, rows: List[Tuple[Any, ...]]) -> str:
+    body = "\n\n".join(_format_point(idx, row) for idx, row in enumerate(rows, 1))
+    return f"{header}\n\nAvailable locations:\n{body}".strip()
+
+
 class ActionProvideSupplyPoints(Action):
     """Provide supply points or contact points"""
 
@@ -1625,7 +2478,7 @@ class ActionProvideSupplyPoints(Action):
         return "action_provide_supply_points"
 
     # Fetches supply or contact points and returns events.
-    def run(self, dispatcher: CollectingDispatcher,
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         location = tracker.get_slot("location")
@@ -1644,85 +2497,45 @@ class ActionProvideSupplyPoints(Action):
             dispatcher.utter_message(text="Please provide your city to continue.")
             return []
 
-        with get_connection() as conn:
-            with conn.cursor() as cur:
-                city_candidates = _build_city_variants(location)
-                if not city_candidates:
-                    dispatcher.utter_message(
-                        text="I could not identify a city from that location. Please try again."
-                    )
-                    return []
-                city_name = _pick_display_city(city_candidates) or location
-
-                if category:
-                    rows = []
-                    for candidate in city_candidates:
-                        cur.execute(
-                            """
-                            SELECT name, address, description, phone, city_name
-                            FROM supply_points
-                            WHERE lower(city_name) = lower(%s) AND category = %s
-                            ORDER BY name
-                            """,
-                            (candidate, category),
-                        )
-                        rows = cur.fetchall()
-                        if rows:
-                            city_name = rows[0][4] or city_name
-                            break
-
-                    category_label = category.replace("_", " ").title()
-                    header = f"SUPPLY POINTS ({category_label}) - {city_name}"
-                    if not rows:
-                        dispatcher.utter_message(
-                            text=f"{header}\n\nNo supply points found for this category in {city_name}."
-                        )
-                        return [SlotSet("supply_type", None)]
-
-                    lines = [header, "", "Available locations:"]
-                    for idx, row in enumerate(rows, 1):
-                        name, address, description, phone, _ = row
-                        lines.append(f"{idx}. {name}")
-                        lines.append(f"   Address: {address}")
-                        if description:
-                            lines.append(f"   Details: {description}")
-                        if phone:
-                            lines.append(f"   Phone: {phone}")
-                        lines.append("")
-
-                    dispatcher.utter_message(text="\n".join(lines).strip())
-                    return [SlotSet("supply_type", None)]
-
-                rows = []
-                for candidate in city_candidates:
-                    cur.execute(
-                        """
-                        SELECT name, address, description, phone, city_name
-                        FROM contact_points
-                        WHERE lower(city_name) = lower(%s)
-                        ORDER BY name
-                        """,
-                        (candidate,),
-                    )
-                    rows = cur.fetchall()
-                    if rows:
-                        city_name = rows[0][4] or city_name
-                        break
+        city_candidates = _build_city_variants(location)
+        if not city_candidates:
+            dispatcher.utter_message(
+                text="I could not identify a city from that location. Please try again."
+            )
+            return []
+        city_name = _pick_display_city(city_candidates) or location
+
+        if category:
+            rows, _ = await asyncio.to_thread(
+                _lookup_city_rows,
+                "supply_by_cat",
+                CITY_SUPPLY_POINTS_SQL,
+                city_candidates,
+                (category,),
+            )
+            if rows:
+                city_name = rows[0][4] or city_name
+
+            category_label = category.replace("_", " ").title()
+            header = f"SUPPLY POINTS ({category_label}) - {city_name}"
+            if not rows:
+                dispatcher.utter_message(
+                    text=f"{header}\n\nNo supply points found for this category in {city_name}."
+                )
+                return [SlotSet("supply_type", None)]
+
+            dispatcher.utter_message(text=_format_points(header, rows))
+            return [SlotSet("supply_type", None)]
+
+        rows, _ = await asyncio.to_thread(
+            _lookup_city_rows, "contact_by_city", CITY_CONTACT_POINTS_SQL, city_candidates
+        )
+        if rows:
+            city_name = rows[0][4] or city_name
 
         if rows:
             header = f"CONTACT POINTS (LEUCHTTUERME) - {city_name}"
-            lines = [header, "", "Available locations:"]
-            for idx, row in enumerate(rows, 1):
-                name, address, description, phone, _ = row
-                lines.append(f"{idx}. {name}")
-                lines.append(f"   Address: {address}")
-                if description:
-                    lines.append(f"   Details: {description}")
-                if phone:
-                    lines.append(f"   Phone: {phone}")
-                lines.append("")
-
-            dispatcher.utter_message(text="\n".join(lines).strip())
+            dispatcher.utter_message(text=_format_points(header, rows))
             return [SlotSet("supply_type", None)]
 
         header = f"CONTACT POINTS (LEUCHTTUERME) - {city_name}"
@@ -1740,7 +2553,7 @@ class ActionProvideEvacuationInfo(Action):
         return "action_provide_evacuation_info"
 
     # Estimates evacuation necessity and returns events.
-    def run(self, dispatcher: CollectingDispatcher,
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         location = tracker.get_slot("location")
@@ -1754,10 +2567,10 @@ class ActionProvideEvacuationInfo(Action):
         display_name = None
 
         if lat is None or lon is None:
-            print("[Location] No coordinates provided. Using Nominatim lookup.")
-            lat, lon, display_name = _geocode_city(str(location))
+            logger.debug("[Location] No coordinates provided. Using Nominatim lookup.")
+            lat, lon, display_name = await asyncio.to_thread(_geocode_city, str(location))
         else:
-            print(f"[Location] Using provided coordinates: lat={lat}, lon={lon}")
+            logger.debug("[Location] Using provided coordinates: lat=%s, lon=%s", lat, lon)
 
         if lat is None or lon is None:
             dispatcher.utter_message(
@@ -1765,7 +2578,7 @@ class ActionProvideEvacuationInfo(Action):
             )
             return []
 
-        stations = _fetch_pegel_stations(lat, lon, radius_km=5)
+        stations = await asyncio.to_thread(_fetch_pegel_stations, lat, lon, radius_km=5)
 
         if not stations:
             risk_label = "Low"
@@ -1810,8 +2623,10 @@ class ActionProvideEvacuationInfo(Action):
             station_lat = _parse_float(selected_station.get("latitude")) if selected_station else None
             station_lon = _parse_float(selected_station.get("longitude")) if selected_station else None
             if station_lat is not None and station_lon is not None:
-                user_elev = _fetch_elevation(lat, lon)
-                station_elev = _fetch_elevation(station_lat, station_lon)
+                user_elev, station_elev = await asyncio.gather(
+                    asyncio.to_thread(_fetch_elevation, lat, lon),
+                    asyncio.to_thread(_fetch_elevation, station_lat, station_lon),
+                )
                 if user_elev is not None and station_elev is not None:
                     diff = user_elev - station_elev
                     if diff < 0:
@@ -1839,7 +2654,7 @@ class ActionEscalateToOperator(Action):
         return "action_escalate_to_operator"
 
     # Creates or updates a handoff request and returns events.
-    def run(self, dispatcher: CollectingDispatcher,
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         conversation_id = tracker.sender_id or "unknown"
@@ -1850,44 +2665,26 @@ class ActionEscalateToOperator(Action):
         latest_text = (tracker.latest_message.get("text") or "").strip()
         summary_json = _build_handoff_summary(tracker)
 
-        request_id = None
-        system_message_id = None
-
-        with get_connection() as conn:
-            with conn.cursor() as cur:
-                request_id = _get_active_handoff_request(cur, conversation_id)
-                if request_id:
-                    cur.execute(
-                        """
-                        UPDATE handoff_requests
-                        SET risk_score = %s,
-                            crisis_type = %s,
-                            user_status = %s,
-                            user_channel = %s,
-                            summary_json = %s
-                        WHERE id = %s
-                        """,
-                        (risk_score, crisis_type, user_status, user_channel, summary_json, request_id),
-                    )
-                else:
-                    cur.execute(
-                        """
-                        INSERT INTO handoff_requests
-                          (conversation_id, status, risk_score, crisis_type, user_status,
-                           user_channel, summary_json)
-                        VALUES (%s, 'open', %s, %s, %s, %s, %s)
-                        RETURNING id
-                        """,
-                        (conversation_id, risk_score, crisis_type, user_status, user_channel, summary_json),
+        def escalate() -> Tuple[int, int]:
+            with get_connection() as conn:
+                with conn.cursor() as cur:
+                    execute_prepared(
+                        cur,
+                        "crisos_escalate_handoff",
+                        ESCALATE_HANDOFF_SQL,
+                        (
+                            conversation_id,
+                            risk_score,
+                            crisis_type,
+                            user_status,
+                            user_channel,
+                            summary_json,
+                            "Escalation created. Waiting for operator assignment.",
+                        ),
                     )
-                    request_id = cur.fetchone()[0]
+                    return cur.fetchone()
 
-                system_message_id = _insert_handoff_message(
-                    cur,
-                    request_id,
-                    "system",
-                    "Escalation created. Waiting for operator assignment.",
-                )
+        request_id, system_message_id = await asyncio.to_thread(escalate)
 
         dispatcher.utter_message(
             text="Connecting you to a human operator now. Please keep this chat open."
@@ -1896,6 +2693,28 @@ class ActionEscalateToOperator(Action):
         return [ActiveLoop(None)]
 
 
+# Utters a RAG answer for text when one is available and returns whether it did.
+async def _utter_rag_answer(dispatcher: CollectingDispatcher, text: str) -> bool:
+    if not text:
+        return False
+    rag_answer = await _rag_dspy_answer_async(text)
+    if not rag_answer:
+        return False
+    dispatcher.utter_message(text=rag_answer)
+    return True
+
+
+TRAPPED_SAFE_FALLBACK_MESSAGE = (
+    "I didn't understand that. Would you like to:\n"
+    "• Continue the assessment\n"
+    "• Speak with an emergency operator"
+)
+TRAPPED_SAFE_FALLBACK_BUTTONS = (
+    {"title": "Continue Assessment", "payload": "/affirm"},
+    {"title": "Speak with Operator", "payload": "/request_operator"},
+)
+
+
 class ActionDefaultFallback(Action):
     """Handle fallback with user status awareness"""
     
@@ -1903,19 +2722,19 @@ class ActionDefaultFallback(Action):
         return "action_default_fallback"
     
     # Handles fallback with RAG and routing, then returns events.
-    def run(self, dispatcher: CollectingDispatcher,
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
 
         user_status = tracker.get_slot("user_status")
         latest_text = (tracker.latest_message.get("text") or "").strip()
+        # Button payloads ("/affirm") and acks ("ok", "?") are not questions; skip RAG and use the canned replies.
+        if latest_text.startswith("/") or not _is_rag_worthy(latest_text):
+            latest_text = ""
         
         if user_status == "safe":
-            if latest_text:
-                rag_answer = _rag_dspy_answer(latest_text)
-                if rag_answer:
-                    dispatcher.utter_message(text=rag_answer)
-                    return []
+            if await _utter_rag_answer(dispatcher, latest_text):
+                return []
             location = tracker.get_slot("location")
             if location:
                 dispatcher.utter_message(response="utter_safe_menu_after_location")
@@ -1923,36 +2742,35 @@ class ActionDefaultFallback(Action):
             return [FollowupAction("safe_info_form")]
         
         elif user_status == "trapped_safe":
-            if latest_text:
-                rag_answer = _rag_dspy_answer(latest_text)
-                if rag_answer:
-                    dispatcher.utter_message(text=rag_answer)
-                    return []
-            message = "I didn't understand that. Would you like to:\n"
-            message += "• Continue the assessment\n"
-            message += "• Speak with an emergency operator"
-            
+            if await _utter_rag_answer(dispatcher, latest_text):
+                return []
             dispatcher.utter_message(
-                text=message,
-                buttons=[
-                    {"title": "Continue Assessment", "payload": "/affirm"},
-                    {"title": "Speak with Operator", "payload": "/request_operator"}
-                ]
+                text=TRAPPED_SAFE_FALLBACK_MESSAGE,
+                buttons=list(TRAPPED_SAFE_FALLBACK_BUTTONS),
             )
         
         elif user_status == "emergency":
-            return [FollowupAction("action_escalate_to_operator")]
+            # Escalate within this call instead of a FollowupAction round trip to the action server.
+            return await ActionEscalateToOperator().run(dispatcher, tracker, domain)
         
         else:
-            if latest_text:
-                rag_answer = _rag_dspy_answer(latest_text)
-                if rag_answer:
-                    dispatcher.utter_message(text=rag_answer)
-                    return []
+            if await _utter_rag_answer(dispatcher, latest_text):
+                return []
             dispatcher.utter_message(response="utter_default_fallback")
         
         return []
 
+# Returns True when the response was already uttered since the latest user message.
+def _uttered_this_turn(tracker: Tracker, response: str) -> bool:
+    for event in reversed(tracker.events or ()):
+        event_type = event.get("event")
+        if event_type == "user":
+            return False
+        if event_type == "bot" and (event.get("metadata") or {}).get("utter_action") == response:
+            return True
+    return False
+
+
 class ActionHandleSafeLocation(Action):
     """Handle location input from safe users and show menu"""
     
@@ -1968,7 +2786,8 @@ class ActionHandleSafeLocation(Action):
         existing_location = tracker.get_slot("location")
         
         if existing_location:
-            dispatcher.utter_message(response="utter_safe_menu_after_location")
+            if not _uttered_this_turn(tracker, "utter_safe_menu_after_location"):
+                dispatcher.utter_message(response="utter_safe_menu_after_location")
             return []
 
         if user_text and not user_text.startswith("/") and _looks_like_location_text(user_text):
@@ -1991,15 +2810,18 @@ class ActionChangeLocation(Action):
         tracker: Tracker,
         domain: Dict[Text, Any],
     ) -> List[Dict[Text, Any]]:
-        location_text = None
-        entities = tracker.latest_message.get("entities") or []
-        for entity in entities:
-            if entity.get("entity") == "location" and entity.get("value"):
-                location_text = str(entity["value"]).strip()
-                break
+        latest_message = tracker.latest_message or {}
+        location_text = next(
+            (
+                str(entity["value"]).strip()
+                for entity in latest_message.get("entities") or []
+                if entity.get("entity") == "location" and entity.get("value")
+            ),
+            None,
+        )
 
         if not location_text:
-            metadata = tracker.latest_message.get("metadata") or {}
+            metadata = latest_message.get("metadata") or {}
             meta_location = metadata.get("location") or {}
             if isinstance(meta_location, dict):
                 location_text = meta_location.get("text")
@@ -2007,7 +2829,7 @@ class ActionChangeLocation(Action):
                 location_text = meta_location
 
         if not location_text:
-            location_text = tracker.latest_message.get("text", "").strip()
+            location_text = (latest_message.get("text") or "").strip()
             if location_text.startswith("/"):
                 location_text = ""
 
@@ -2025,7 +2847,7 @@ class ActionHandleGeneralInfo(Action):
         return "action_handle_general_info"
 
     # Routes general info questions and returns events.
-    def run(
+    async def run(
         self,
         dispatcher: CollectingDispatcher,
         tracker: Tracker,
@@ -2039,9 +2861,7 @@ class ActionHandleGeneralInfo(Action):
             else:
                 dispatcher.utter_message(response="utter_ask_user_status")
             return []
-        rag_answer = _rag_dspy_answer(latest_text)
-        if rag_answer:
-            dispatcher.utter_message(text=rag_answer)
+        if await _utter_rag_answer(dispatcher, latest_text):
             return []
         if user_status:
             dispatcher.utter_message(response="utter_ask_info_type")
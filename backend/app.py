@@ -1,15 +1,26 @@
-import hashlib
+import functools
 import os
+import queue
 import re
 import secrets
+import shutil
+import threading
 import time
 import sys
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, List, Optional
 
+import anyio
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from fastapi import FastAPI, HTTPException, Query, Header, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic import BaseModel
 
 try:
@@ -17,19 +28,59 @@ try:
 except Exception:  
     MarianMTModel = None
     MarianTokenizer = None
+try:
+    import torch
+except ImportError:
+    torch = None
+try:
+    from py3langid.langid import MODEL_DIR as LANGID_MODEL_DIR, MODEL_FILE as LANGID_MODEL_FILE, LanguageIdentifier
+except ImportError:
+    LanguageIdentifier = None
+try:
+    from faster_whisper import WhisperModel
+except ImportError:
+    WhisperModel = None
+try:
+    from argon2.exceptions import Argon2Error, InvalidHashError
+except ImportError:
+    Argon2Error = InvalidHashError = Exception
+try:
+    import ctranslate2
+except ImportError:
+    ctranslate2 = None
 from psycopg2 import sql
+from psycopg2.extensions import ISOLATION_LEVEL_REPEATABLE_READ
+from psycopg2.extras import execute_values
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
     sys.path.append(str(ROOT_DIR))
 
-from db.connection import get_connection
+from db.connection import (
+    close_pool,
+    get_connection,
+    get_readonly_connection,
+    run_transaction,
+    warm_pool,
+)
 from db import init_db as db_init
 
 RASA_URL = os.getenv("RASA_URL", "http://localhost:5005/webhooks/rest/webhook")
 FRONTEND_ORIGIN = os.getenv("FRONTEND_ORIGIN", "http://localhost:5173")
-ADMIN_PASSWORD_SALT = os.getenv("ADMIN_PASSWORD_SALT", "crisis_salt")
 TOKEN_STORE = {}
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "100"))  # Concurrent sync route calls (AnyIO default: 40)
+HANDOFF_PAGE_SIZE = 50   # Default handoff queue page; clients follow next_cursor for more
+HANDOFF_PAGE_MAX = 200
+TRANSCRIBE_MAX_BYTES = int(os.getenv("TRANSCRIBE_MAX_BYTES", str(25 * 1024 * 1024)))  # OpenAI's upload limit
+TRANSCRIBE_BACKEND = os.getenv("TRANSCRIBE_BACKEND", "openai").lower()
+LOCAL_WHISPER_MODEL = os.getenv("LOCAL_WHISPER_MODEL", "small")
+WHISPER_MODEL = None
+WHISPER_MODEL_LOCK = threading.Lock()
 
 TRANSLATION_MODELS = {
     ("tr", "en"): "Helsinki-NLP/opus-mt-tr-en",
@@ -37,14 +88,35 @@ TRANSLATION_MODELS = {
     ("de", "en"): "Helsinki-NLP/opus-mt-de-en",
     ("en", "de"): "Helsinki-NLP/opus-mt-en-de",
 }
-TRANSLATION_CACHE = {}
+TRANSLATION_CACHE = OrderedDict()
+TRANSLATION_CACHE_LOCK = threading.Lock()
 TRANSLATOR_CACHE = {}
+TRANSLATOR_LOADING = {}
+TRANSLATOR_LOCK = threading.Lock()
 TRANSLATION_CACHE_LIMIT = 1000
+TRANSLATION_BACKEND = os.getenv("TRANSLATION_BACKEND", "ctranslate2").lower()
+TRANSLATION_MAX_LENGTH = 512
+TRANSLATION_MAX_BATCH = 16      # Max queued texts decoded together in one call
+LANGID_MIN_CHARS = 12           # Shorter texts (button titles, "OK") are too ambiguous to detect
+LANGID_MIN_CONFIDENCE = 0.95    # Skip translation only when detection is this sure
+TRANSLATION_BEAM_OVERRIDES = {}  # model_name -> beam count, for models where greedy output regresses
+TRANSLATION_TIMEOUT = 30.0      # Seconds to wait for a queued translation
+CT2_MODEL_DIR = ROOT_DIR / ".cache" / "ct2"
 BUND_ALERT_SOURCES = {
     "dwd": "https://warnung.bund.de/api31/dwd/mapData.json",
     "mowas": "https://warnung.bund.de/api31/mowas/mapData.json",
 }
 ALERT_SEVERITY_LEVELS = {"severe", "extreme"}
+ALERT_FETCH_TIMEOUT = 8
+ALERTS_TTL = int(os.getenv("ALERTS_TTL_SEC", "60"))
+_ALERTS_CACHE = {"ts": 0.0, "data": []}
+_ALERTS_LOCK = threading.Lock()
+_ALERT_SOURCE_CACHE = {}
+COORDS_RE = re.compile(r"^\s*-?\d+(\.\d+)?\s*,\s*-?\d+(\.\d+)?\s*$")
+DIGIT_RUN_RE = re.compile(r"\d{2,}")
+NO_TRANSLATE_IN_RE = re.compile(r"^\s*[/\[{]")
+NO_TRANSLATE_OUT_RE = re.compile(r"^\s*/|https?://")
+ADDRESS_TOKEN_RE = re.compile(r"strasse|street|road|\brd\b|avenue|\bave\b|platz|plz|str\.")
 
 ADMIN_TABLES = {
     "users",
@@ -58,8 +130,47 @@ OPERATOR_TABLES = {
     "supply_points",
     "contact_points",
 }
+PROTECTED_USERNAME = "crisos_admin"  # Seeded admin that the table editor may not change or delete
+TABLE_META_CACHE = {}  # table -> (fetched_at, columns, primary_key)
+TABLE_META_LOCK = threading.Lock()
+TABLE_META_TTL = 300  # Seconds before a table's metadata is re-read, so migrations show up on their own
+
+# Creates a keep-alive session so repeated upstream calls reuse TLS connections.
+def _create_http_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=128,
+        # Retries idempotent requests (and failed connects) on gateway errors; POSTs are not resent.
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504)),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Shared by Rasa, OpenAI, Nominatim and the alert feeds.
+HTTP = _create_http_session()
+
+if torch is not None:
+    # Let any remaining FP32 matmuls use TF32 tensor cores on GPUs that have them.
+    torch.set_float32_matmul_precision("high")
+    torch.backends.cuda.matmul.allow_tf32 = True
+    # One inter-op thread per decode; the request threadpool already provides concurrency.
+    torch.set_num_threads(int(os.getenv("TORCH_NUM_THREADS", str(os.cpu_count() or 4))))
+    torch.set_num_interop_threads(1)
+
+app = FastAPI(
+    title="CRISOS Local Gateway",
+    version="0.1.0",
+    default_response_class=ORJSONResponse if orjson is not None else JSONResponse,
+)
+
 
-app = FastAPI(title="CRISOS Local Gateway", version="0.1.0")
+# Sizes the worker thread pool that runs the sync (DB, translation) routes.
+@app.on_event("startup")
+async def configure_threadpool() -> None:
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
 
 
 # Runs the DB initializer during app startup.
@@ -70,20 +181,39 @@ def init_db_on_startup() -> None:
     except Exception as exc:
         print(f"[DB] Init failed: {exc}")
         raise
+    try:
+        warm_pool()
+    except Exception as exc:
+        print(f"[DB] Pool warm-up skipped: {exc}")
+
+
+# Reads the admin tables' column metadata once so CRUD calls skip information_schema.
+@app.on_event("startup")
+def warmup_table_meta() -> None:
+    try:
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                for table in sorted(ADMIN_TABLES | OPERATOR_TABLES):
+                    _get_table_meta(cur, table)
+    except Exception as exc:
+        print(f"[DB] Table metadata warm-up skipped: {exc}")
 
 
-# Loads translation models into cache on startup.
+# Loads translation models concurrently in the background so startup is not blocked.
 @app.on_event("startup")
 def warmup_translators() -> None:
-    for model_name in TRANSLATION_MODELS.values():
-        _get_translator(model_name)
+    def load_all() -> None:
+        with ThreadPoolExecutor(max_workers=len(TRANSLATION_MODELS)) as executor:
+            list(executor.map(_get_translator, TRANSLATION_MODELS.values()))
+
+    threading.Thread(target=load_all, name="translator-warmup", daemon=True).start()
 
 
 # Sends a dummy message to warm up the Rasa model and reduce first-request delay.
 @app.on_event("startup")
 def warmup_rasa() -> None:
     try:
-        requests.post(
+        HTTP.post(
             RASA_URL,
             json={"sender": "warmup", "message": "hello"},
             timeout=10,
@@ -92,7 +222,25 @@ def warmup_rasa() -> None:
         print(f"[Rasa] Warm-up skipped: {exc}")
 
 
+# Closes the pooled DB connections so Postgres backends are released on shutdown.
+@app.on_event("shutdown")
+def close_db_pool() -> None:
+    close_pool()
+
+
+# Parses a JSON response body (with orjson when available) and returns it.
+def _response_json(response: requests.Response):
+    if orjson is None:
+        return response.json()
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError as exc:
+        # Match response.json(), whose decode error is also a RequestException.
+        raise requests.exceptions.JSONDecodeError(exc.msg, exc.doc, exc.pos) from exc
+
+
 # Normalizes a locale string and returns the short code.
+@functools.lru_cache(maxsize=512)
 def _normalize_locale(locale: Optional[str]) -> str:
     if not locale:
         return "en"
@@ -101,118 +249,305 @@ def _normalize_locale(locale: Optional[str]) -> str:
 
 # Checks if text looks like coordinates and returns True/False.
 def _looks_like_coords(text: str) -> bool:
-    return bool(
-        re.match(r"^\s*-?\d+(\.\d+)?\s*,\s*-?\d+(\.\d+)?\s*$", text)
-    )
+    return bool(COORDS_RE.match(text))
 
 
 # Checks if text looks like an address and returns True/False.
 def _looks_like_address(text: str) -> bool:
-    lowered = text.lower()
-    if re.search(r"\d{2,}", text) and "," in text:
+    if "," in text and DIGIT_RUN_RE.search(text):
         return True
-    address_tokens = [
-        "strasse",
-        "street",
-        "road",
-        "rd",
-        "avenue",
-        "ave",
-        "platz",
-        "plz",
-        "str.",
-    ]
-    return any(token in lowered for token in address_tokens)
+    return ADDRESS_TOKEN_RE.search(text.lower()) is not None
 
 
 # Decides if inbound text should be translated and returns True/False.
+@functools.lru_cache(maxsize=4096)
 def _should_translate_inbound(text: str) -> bool:
-    if not text:
+    if not text or NO_TRANSLATE_IN_RE.match(text):
         return False
-    stripped = text.strip()
-    if stripped.startswith("/"):
-        return False
-    if stripped.startswith("{") or stripped.startswith("["):
-        return False
-    if _looks_like_coords(text) or _looks_like_address(text):
-        return False
-    return True
+    return not (_looks_like_coords(text) or _looks_like_address(text))
 
 
 # Decides if outbound text should be translated and returns True/False.
+@functools.lru_cache(maxsize=4096)
 def _should_translate_outbound(text: str) -> bool:
-    if not text:
+    if not text or NO_TRANSLATE_OUT_RE.search(text):
         return False
-    stripped = text.strip()
-    if stripped.startswith("/"):
-        return False
-    if "http://" in text or "https://" in text:
-        return False
-    if _looks_like_coords(text):
-        return False
-    return True
+    return not _looks_like_coords(text)
 
 
-# Loads or returns a cached Marian translator and returns it or None.
-def _get_translator(model_name: str):
-    if MarianTokenizer is None or MarianMTModel is None:
+# Converts a Marian model to int8 CTranslate2 format once and returns its directory or None.
+def _convert_to_ctranslate2(model_name: str) -> Optional[Path]:
+    output_dir = CT2_MODEL_DIR / model_name.replace("/", "--")
+    if (output_dir / "model.bin").exists():
+        return output_dir
+    tmp_dir = output_dir.with_name(output_dir.name + f".tmp{os.getpid()}")
+    try:
+        CT2_MODEL_DIR.mkdir(parents=True, exist_ok=True)
+        converter = ctranslate2.converters.TransformersConverter(model_name)
+        converter.convert(str(tmp_dir), quantization="int8", force=True)
+        try:
+            os.replace(tmp_dir, output_dir)
+        except OSError:
+            # Another worker finished the same conversion first.
+            pass
+        return output_dir if (output_dir / "model.bin").exists() else None
+    except Exception as exc:
+        print(f"[Translation] CTranslate2 conversion failed for {model_name}: {exc}")
         return None
-    if model_name in TRANSLATOR_CACHE:
-        return TRANSLATOR_CACHE[model_name]
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+# Loads an int8 CTranslate2 translator for a Marian model and returns it or None.
+def _load_ctranslate2_model(model_name: str):
+    if ctranslate2 is None or TRANSLATION_BACKEND != "ctranslate2":
+        return None
+    model_dir = _convert_to_ctranslate2(model_name)
+    if model_dir is None:
+        return None
+    device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+    try:
+        return ctranslate2.Translator(
+            str(model_dir),
+            device=device,
+            compute_type="int8_float16" if device == "cuda" else "int8",
+            inter_threads=1,
+            intra_threads=os.cpu_count() or 1,
+        )
+    except Exception as exc:
+        print(f"[Translation] CTranslate2 load failed for {model_name}: {exc}")
+        return None
+
+
+class _TranslationBatcher:
+    """Coalesces concurrent translations for one model into batched decode calls."""
+
+    # Stores the tokenizer/model pair and starts the background decoder thread.
+    def __init__(self, translator, model_name: str, max_batch: int = TRANSLATION_MAX_BATCH):
+        self.translator = translator
+        self.num_beams = TRANSLATION_BEAM_OVERRIDES.get(model_name, 1)
+        self.max_batch = max_batch
+        self.queue: "queue.Queue[tuple]" = queue.Queue()
+        self.worker = threading.Thread(
+            target=self._run, name=f"translate-{model_name}", daemon=True
+        )
+        self.worker.start()
+
+    # Queues texts together and returns their translations (None where one failed).
+    def translate_many(self, texts: list, timeout: float = TRANSLATION_TIMEOUT) -> list:
+        futures = []
+        for text in texts:
+            future: Future = Future()
+            self.queue.put((text, future))
+            futures.append(future)
+        deadline = time.monotonic() + timeout
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result(timeout=max(deadline - time.monotonic(), 0)))
+            except Exception:
+                results.append(None)
+        return results
+
+    # Drains queued texts and decodes them together until the process exits.
+    def _run(self) -> None:
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                decoded = _generate_translations(
+                    self.translator, [text for text, _ in batch], self.num_beams
+                )
+            except Exception as exc:
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+            for (text, future), result in zip(batch, decoded):
+                future.set_result(result or text)
+
+
+# Loads a Hugging Face artifact from the local cache, downloading only when it is missing.
+def _from_pretrained(cls, model_name: str, token: Optional[str]):
+    try:
+        return cls.from_pretrained(model_name, token=token, local_files_only=True)
+    except OSError:
+        return cls.from_pretrained(model_name, token=token)
+
+
+# Loads a Marian model into a batching translator and returns it or None.
+def _load_translator(model_name: str):
     token = os.getenv("HF_TOKEN")
     try:
-        tokenizer = MarianTokenizer.from_pretrained(model_name, token=token)
-        model = MarianMTModel.from_pretrained(model_name, token=token)
-        model.eval()
-        TRANSLATOR_CACHE[model_name] = (tokenizer, model)
-        return TRANSLATOR_CACHE[model_name]
+        tokenizer = _from_pretrained(MarianTokenizer, model_name, token)
+        # Prefer the int8 CTranslate2 runtime; fall back to the PyTorch model.
+        model = _load_ctranslate2_model(model_name)
+        if model is None:
+            model = _from_pretrained(MarianMTModel, model_name, token)
+            if torch is not None and torch.cuda.is_available():
+                model = model.to(device="cuda", dtype=torch.float16)
+            model.requires_grad_(False)
+            model.eval()
+        return _TranslationBatcher((tokenizer, model), model_name)
     except Exception as exc:
         print(f"[Translation] Failed to load {model_name}: {exc}")
-        TRANSLATOR_CACHE[model_name] = None
         return None
 
 
-# Stores a translation result in the in-memory cache.
+# Loads or returns the cached batching translator for a Marian model, or None.
+def _get_translator(model_name: str, timeout: Optional[float] = None):
+    if MarianTokenizer is None or MarianMTModel is None:
+        return None
+    if model_name in TRANSLATOR_CACHE:
+        return TRANSLATOR_CACHE[model_name]
+    with TRANSLATOR_LOCK:
+        if model_name in TRANSLATOR_CACHE:
+            return TRANSLATOR_CACHE[model_name]
+        loading = TRANSLATOR_LOADING.get(model_name)
+        if loading is None:
+            loading = TRANSLATOR_LOADING[model_name] = Future()
+            owner = True
+        else:
+            owner = False
+    if not owner:
+        # Another thread is loading this model; wait for it instead of loading a second copy.
+        try:
+            return loading.result(timeout=timeout)
+        except Exception:
+            return None
+    translator = _load_translator(model_name)
+    with TRANSLATOR_LOCK:
+        TRANSLATOR_CACHE[model_name] = translator
+        TRANSLATOR_LOADING.pop(model_name, None)
+    loading.set_result(translator)
+    return translator
+
+
+# Loads the language identifier restricted to the translated languages and returns it or None.
+@functools.lru_cache(maxsize=1)
+def _get_language_identifier():
+    if LanguageIdentifier is None:
+        return None
+    identifier = LanguageIdentifier.from_modelpath(LANGID_MODEL_DIR / LANGID_MODEL_FILE, norm_probs=True)
+    identifier.set_languages(sorted({lang for pair in TRANSLATION_MODELS for lang in pair}))
+    return identifier
+
+
+# Detects the language of a text and returns its code when confident, or None.
+@functools.lru_cache(maxsize=4096)
+def _detect_language(text: str) -> Optional[str]:
+    if len(text) < LANGID_MIN_CHARS:
+        return None
+    identifier = _get_language_identifier()
+    if identifier is None:
+        return None
+    lang, confidence = identifier.classify(text)
+    return lang if confidence >= LANGID_MIN_CONFIDENCE else None
+
+
+# Returns a cached translation and marks it recently used, or None.
+def _get_cached_translation(key):
+    with TRANSLATION_CACHE_LOCK:
+        value = TRANSLATION_CACHE.get(key)
+        if value is not None:
+            TRANSLATION_CACHE.move_to_end(key)
+        return value
+
+
+# Stores a translation result in the in-memory cache, evicting the least recently used.
 def _cache_translation(key, value):
-    if len(TRANSLATION_CACHE) >= TRANSLATION_CACHE_LIMIT:
-        TRANSLATION_CACHE.clear()
-    TRANSLATION_CACHE[key] = value
+    with TRANSLATION_CACHE_LOCK:
+        TRANSLATION_CACHE[key] = value
+        TRANSLATION_CACHE.move_to_end(key)
+        while len(TRANSLATION_CACHE) > TRANSLATION_CACHE_LIMIT:
+            TRANSLATION_CACHE.popitem(last=False)
+
+
+# Caps decoding at 1.5x the input tokens plus slack (at most TRANSLATION_MAX_LENGTH) and returns it.
+def _max_output_length(input_tokens: int) -> int:
+    return min(TRANSLATION_MAX_LENGTH, int(input_tokens * 1.5) + 16)
+
+
+# Runs a loaded translator over a list of texts and returns the decoded translations.
+def _generate_translations(translator, texts: list, num_beams: int = 1) -> list:
+    tokenizer, model = translator
+    if ctranslate2 is not None and isinstance(model, ctranslate2.Translator):
+        sources = [
+            tokenizer.convert_ids_to_tokens(
+                tokenizer.encode(text, truncation=True, max_length=TRANSLATION_MAX_LENGTH)
+            )
+            for text in texts
+        ]
+        results = model.translate_batch(
+            sources,
+            beam_size=num_beams,
+            max_decoding_length=_max_output_length(max(len(source) for source in sources)),
+        )
+        return [
+            tokenizer.decode(
+                tokenizer.convert_tokens_to_ids(result.hypotheses[0]),
+                skip_special_tokens=True,
+            )
+            for result in results
+        ]
+    batch = tokenizer(texts, return_tensors="pt", padding=True, truncation=True).to(model.device)
+    with torch.inference_mode():
+        generated = model.generate(
+            **batch,
+            num_beams=num_beams,
+            do_sample=False,
+            max_length=_max_output_length(batch["input_ids"].shape[1]),
+            use_cache=True,
+        )
+    return tokenizer.batch_decode(generated, skip_special_tokens=True)
+
+
+# Translates texts in one batch (deduplicated, cache first) and returns them in input order.
+def _translate_texts(texts: list, source_lang: str, target_lang: str) -> list:
+    model_name = TRANSLATION_MODELS.get((source_lang, target_lang))
+    if source_lang == target_lang or not model_name:
+        return list(texts)
+    results = {}
+    pending = []
+    for text in dict.fromkeys(texts):
+        cached = _get_cached_translation((model_name, text)) if text else None
+        if cached:
+            results[text] = cached
+        # Text already in the target language (e.g. a German user typing in English) needs no decoder pass.
+        elif not text or _detect_language(text) == target_lang:
+            results[text] = text
+        else:
+            pending.append(text)
+    if pending:
+        translator = _get_translator(model_name, timeout=TRANSLATION_TIMEOUT)
+        translated = translator.translate_many(pending) if translator else [None] * len(pending)
+        for text, result in zip(pending, translated):
+            if result is None:
+                results[text] = text
+                continue
+            _cache_translation((model_name, text), result)
+            results[text] = result
+    return [results[text] for text in texts]
 
 
 # Translates a single text and returns the translated string.
 def _translate_text(text: str, source_lang: str, target_lang: str) -> str:
-    if not text or source_lang == target_lang:
-        return text
-    model_name = TRANSLATION_MODELS.get((source_lang, target_lang))
-    if not model_name:
-        return text
-    key = (model_name, text)
-    cached = TRANSLATION_CACHE.get(key)
-    if cached:
-        return cached
-    translator = _get_translator(model_name)
-    if not translator:
-        return text
-    tokenizer, model = translator
-    try:
-        batch = tokenizer([text], return_tensors="pt", truncation=True)
-        generated = model.generate(**batch, max_length=512)
-        decoded = tokenizer.batch_decode(generated, skip_special_tokens=True)
-        result = decoded[0] if decoded else text
-        _cache_translation(key, result)
-        return result
-    except Exception:
+    if not text:
         return text
+    return _translate_texts([text], source_lang, target_lang)[0]
 
 
 # Calls OpenAI Whisper and returns the transcript text.
-def _transcribe_with_openai(audio_bytes: bytes, filename: str, language: Optional[str]) -> str:
+def _transcribe_with_openai(audio_file: BinaryIO, filename: str, language: Optional[str]) -> str:
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise HTTPException(status_code=500, detail="OPENAI_API_KEY is not set.")
     model = os.getenv("OPENAI_WHISPER_MODEL", "whisper-1")
     files = {
-        "file": (filename or "audio.webm", audio_bytes),
+        "file": (filename or "audio.webm", audio_file),
     }
     data = {
         "model": model,
@@ -221,7 +556,7 @@ def _transcribe_with_openai(audio_bytes: bytes, filename: str, language: Optiona
     if language in {"en", "de", "tr"}:
         data["language"] = language
     try:
-        response = requests.post(
+        response = HTTP.post(
             "https://api.openai.com/v1/audio/transcriptions",
             headers={"Authorization": f"Bearer {api_key}"},
             files=files,
@@ -231,11 +566,47 @@ def _transcribe_with_openai(audio_bytes: bytes, filename: str, language: Optiona
         response.raise_for_status()
     except requests.RequestException as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
-    payload = response.json()
+    payload = _response_json(response)
     text = (payload.get("text") or "").strip()
     return text
 
 
+# Loads the local faster-whisper model once (int8, on GPU when available) and returns it or None.
+def _get_whisper_model():
+    global WHISPER_MODEL
+    if WhisperModel is None:
+        return None
+    with WHISPER_MODEL_LOCK:
+        if WHISPER_MODEL is None:
+            cuda = ctranslate2 is not None and ctranslate2.get_cuda_device_count() > 0
+            try:
+                WHISPER_MODEL = WhisperModel(
+                    LOCAL_WHISPER_MODEL,
+                    device="cuda" if cuda else "cpu",
+                    compute_type="int8_float16" if cuda else "int8",
+                    cpu_threads=os.cpu_count() or 1,
+                    num_workers=1,
+                )
+            except Exception as exc:
+                print(f"[Whisper] Failed to load {LOCAL_WHISPER_MODEL}: {exc}")
+                return None
+    return WHISPER_MODEL
+
+
+# Transcribes audio with the local faster-whisper model and returns the transcript text.
+def _transcribe_locally(audio_file: BinaryIO, language: Optional[str]) -> str:
+    model = _get_whisper_model()
+    if model is None:
+        raise HTTPException(status_code=500, detail="Local Whisper model is not available.")
+    segments, _info = model.transcribe(
+        audio_file,
+        language=language if language in {"en", "de", "tr"} else None,
+        vad_filter=True,
+        beam_size=1,
+    )
+    return "".join(segment.text for segment in segments).strip()
+
+
 # Translates outgoing messages and returns the updated list.
 def _translate_messages(messages, target_lang: str):
     if target_lang == "en":
@@ -245,6 +616,8 @@ def _translate_messages(messages, target_lang: str):
     if not isinstance(messages, list):
         return messages
     translated = []
+    # Collect every message text and button title first so the whole reply is decoded as one batch.
+    slots = []
     for message in messages:
         if not isinstance(message, dict):
             translated.append(message)
@@ -252,7 +625,7 @@ def _translate_messages(messages, target_lang: str):
         updated = dict(message)
         text = updated.get("text")
         if isinstance(text, str) and _should_translate_outbound(text):
-            updated["text"] = _translate_text(text, "en", target_lang)
+            slots.append((updated, "text"))
         buttons = updated.get("buttons")
         if isinstance(buttons, list):
             new_buttons = []
@@ -263,10 +636,14 @@ def _translate_messages(messages, target_lang: str):
                 button_copy = dict(button)
                 title = button_copy.get("title")
                 if isinstance(title, str) and _should_translate_outbound(title):
-                    button_copy["title"] = _translate_text(title, "en", target_lang)
+                    slots.append((button_copy, "title"))
                 new_buttons.append(button_copy)
             updated["buttons"] = new_buttons
         translated.append(updated)
+    if slots:
+        results = _translate_texts([target[field] for target, field in slots], "en", target_lang)
+        for (target, field), result in zip(slots, results):
+            target[field] = result
     return translated
 
 app.add_middleware(
@@ -312,15 +689,33 @@ class AdminTablePayload(BaseModel):
     data: dict
 
 
+class AdminTableBulkPayload(BaseModel):
+    rows: List[dict]
+
+
 class ChangePasswordRequest(BaseModel):
     current_password: str
     new_password: str
 
 
-# Hashes a password with salt and returns the hex digest.
+# Hashes a password (argon2id when available) and returns the encoded hash.
 def _hash_password(password: str) -> str:
-    salted = f"{ADMIN_PASSWORD_SALT}:{password}".encode("utf-8")
-    return hashlib.sha256(salted).hexdigest()
+    return db_init.hash_password(password)
+
+
+# Checks a password against a stored hash and returns (matches, needs_rehash).
+def _verify_password(password_hash: str, password: str):
+    if db_init.LEGACY_PASSWORD_HASH_RE.match(password_hash or ""):
+        # Salted SHA-256 rows from before argon2; upgraded on the next successful login.
+        matches = secrets.compare_digest(password_hash, db_init.legacy_hash_password(password))
+        return matches, matches and db_init.PASSWORD_HASHER is not None
+    if db_init.PASSWORD_HASHER is None:
+        return False, False
+    try:
+        db_init.PASSWORD_HASHER.verify(password_hash, password)
+    except (Argon2Error, InvalidHashError):
+        return False, False
+    return True, db_init.PASSWORD_HASHER.check_needs_rehash(password_hash)
 
 
 # Extracts the bearer token and returns it.
@@ -344,16 +739,51 @@ def _require_auth(authorization: Optional[str], roles: Optional[set] = None) ->
     return info
 
 
-# Fetches severe alerts and returns a list.
+_ALERT_EXECUTOR = ThreadPoolExecutor(max_workers=len(BUND_ALERT_SOURCES), thread_name_prefix="bund-alerts")
+
+
+# Fetches one alert feed (revalidating the last copy with ETag/Last-Modified) and returns its JSON list, or None.
+def _fetch_bund_source(url: str):
+    cached = _ALERT_SOURCE_CACHE.get(url)
+    headers = {}
+    if cached:
+        if cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+    try:
+        response = HTTP.get(url, headers=headers, timeout=ALERT_FETCH_TIMEOUT)
+        if response.status_code == 304 and cached:
+            return cached["payload"]
+        response.raise_for_status()
+        payload = _response_json(response)
+    except (requests.RequestException, ValueError):
+        return None
+    _ALERT_SOURCE_CACHE[url] = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "payload": payload,
+    }
+    return payload
+
+
+# Returns severe alerts, refreshing them from upstream at most once per ALERTS_TTL seconds.
 def _fetch_bund_alerts() -> list:
+    with _ALERTS_LOCK:
+        now = time.monotonic()
+        if _ALERTS_CACHE["ts"] and now - _ALERTS_CACHE["ts"] < ALERTS_TTL:
+            return _ALERTS_CACHE["data"]
+        alerts = _load_bund_alerts()
+        _ALERTS_CACHE.update(ts=now, data=alerts)
+        return alerts
+
+
+# Fetches severe alerts from all sources and returns a sorted list.
+def _load_bund_alerts() -> list:
     alerts = []
-    for source, url in BUND_ALERT_SOURCES.items():
-        try:
-            response = requests.get(url, timeout=8)
-            response.raise_for_status()
-            payload = response.json()
-        except (requests.RequestException, ValueError):
-            continue
+    # Both feeds are fetched at once, so the wait is the slower feed rather than the sum.
+    payloads = _ALERT_EXECUTOR.map(_fetch_bund_source, BUND_ALERT_SOURCES.values())
+    for source, payload in zip(BUND_ALERT_SOURCES, payloads):
         if not isinstance(payload, list):
             continue
         # Keep only severe/extreme alerts and prefer EN title with DE fallback.
@@ -383,15 +813,17 @@ def _fetch_bund_alerts() -> list:
     return alerts
 
 
+# Wraps a list payload in an orjson response (skipping FastAPI's encoder) and returns it.
+def _json_response(payload: dict):
+    if orjson is None:
+        return payload
+    return ORJSONResponse(payload)
+
+
 # Converts a DB row to a dict and returns it.
 def _serialize_row(columns, row):
-    payload = {}
-    for key, value in zip(columns, row):
-        if hasattr(value, "isoformat"):
-            payload[key] = value.isoformat()
-        else:
-            payload[key] = value
-    return payload
+    # Dates and timestamps are encoded to ISO-8601 by the response layer.
+    return dict(zip(columns, row))
 
 
 # Builds a short address label and returns it.
@@ -469,6 +901,25 @@ def _fetch_table_meta(cur, table: str):
     return columns, primary_key
 
 
+# Returns cached columns and primary key for a table, re-reading information_schema once stale.
+def _get_table_meta(cur, table: str):
+    entry = TABLE_META_CACHE.get(table)
+    now = time.monotonic()
+    if entry is None or now - entry[0] > TABLE_META_TTL:
+        columns, primary_key = _fetch_table_meta(cur, table)
+        entry = (now, columns, primary_key)
+        with TABLE_META_LOCK:
+            TABLE_META_CACHE[table] = entry
+    return entry[1], entry[2]
+
+
+# Raises 403 when a guarded users mutation matched nothing because the row is the protected admin.
+def _reject_protected_user(cur, row_id: str, detail: str) -> None:
+    cur.execute("SELECT 1 FROM users WHERE id = %s AND username = %s", (row_id, PROTECTED_USERNAME))
+    if cur.fetchone():
+        raise HTTPException(status_code=403, detail=detail)
+
+
 # Simple health check endpoint that returns ok.
 @app.get("/api/health")
 def health():
@@ -498,7 +949,7 @@ def send_message(payload: ChatRequest):
 
     try:
         t1 = time.perf_counter()
-        response = requests.post(
+        response = HTTP.post(
             RASA_URL,
             json={
                 "sender": payload.sender_id,
@@ -512,7 +963,7 @@ def send_message(payload: ChatRequest):
     except requests.RequestException as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
 
-    messages = response.json()
+    messages = _response_json(response)
     t2 = time.perf_counter()
     translated_messages = _translate_messages(messages, locale)
     translate_out_time = time.perf_counter() - t2
@@ -525,6 +976,16 @@ def send_message(payload: ChatRequest):
     return {"messages": translated_messages}
 
 
+# Returns the byte size of an upload without reading it into memory.
+def _upload_size(upload: UploadFile) -> int:
+    if upload.size is not None:
+        return upload.size
+    upload.file.seek(0, os.SEEK_END)
+    size = upload.file.tell()
+    upload.file.seek(0)
+    return size
+
+
 # Accepts audio, transcribes it, and returns the text.
 @app.post("/api/transcribe")
 async def transcribe_audio(
@@ -536,16 +997,25 @@ async def transcribe_audio(
 
     suffix = Path(audio.filename or "").suffix or ".webm"
     lang = _normalize_locale(locale)
-    content = await audio.read()
-    if not content:
+    size = _upload_size(audio)
+    if not size:
         raise HTTPException(status_code=400, detail="Empty audio file.")
+    if size > TRANSCRIBE_MAX_BYTES:
+        raise HTTPException(status_code=413, detail="Audio file too large.")
+
+    if TRANSCRIBE_BACKEND == "local":
+        text = await run_in_threadpool(_transcribe_locally, audio.file, lang)
+        return {"text": text}
 
     if not os.getenv("OPENAI_API_KEY"):
         raise HTTPException(
             status_code=500,
             detail="OPENAI_API_KEY is not set. Transcription uses the OpenAI API.",
         )
-    text = _transcribe_with_openai(content, audio.filename or f"audio{suffix}", lang)
+    # Hand the spooled upload straight to requests, off the event loop.
+    text = await run_in_threadpool(
+        _transcribe_with_openai, audio.file, audio.filename or f"audio{suffix}", lang
+    )
     return {"text": text}
 
 
@@ -568,8 +1038,16 @@ def admin_login(payload: AdminLoginRequest):
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
     user_id, username, password_hash, user_type = row
-    if password_hash != _hash_password(payload.password):
+    matches, needs_rehash = _verify_password(password_hash, payload.password)
+    if not matches:
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    if needs_rehash:
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "UPDATE users SET password_hash = %s WHERE id = %s",
+                    (_hash_password(payload.password), user_id),
+                )
 
     token = secrets.token_hex(16)
     TOKEN_STORE[token] = {
@@ -588,7 +1066,6 @@ def admin_change_password(
     authorization: Optional[str] = Header(default=None),
 ):
     info = _require_auth(authorization, roles={"admin", "operator"})
-    current_hash = _hash_password(payload.current_password)
     if not payload.new_password:
         raise HTTPException(status_code=400, detail="New password required")
     new_hash = _hash_password(payload.new_password)
@@ -600,7 +1077,7 @@ def admin_change_password(
                 (info["user_id"],),
             )
             row = cur.fetchone()
-            if not row or row[0] != current_hash:
+            if not row or not _verify_password(row[0], payload.current_password)[0]:
                 raise HTTPException(status_code=400, detail="Invalid current password")
             cur.execute(
                 "UPDATE users SET password_hash = %s WHERE id = %s",
@@ -638,14 +1115,14 @@ def geocode(query: str):
     }
     headers = {"User-Agent": "crisisbot2/1.0 (geocode)"}
     try:
-        response = requests.get(
+        response = HTTP.get(
             "https://nominatim.openstreetmap.org/search",
             params=params,
             headers=headers,
             timeout=8,
         )
         response.raise_for_status()
-        data = response.json()
+        data = _response_json(response)
     except requests.RequestException as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
 
@@ -701,14 +1178,14 @@ def reverse_geocode(lat: float, lon: float):
     }
     headers = {"User-Agent": "crisisbot2/1.0 (reverse geocode)"}
     try:
-        response = requests.get(
+        response = HTTP.get(
             "https://nominatim.openstreetmap.org/reverse",
             params=params,
             headers=headers,
             timeout=8,
         )
         response.raise_for_status()
-        data = response.json()
+        data = _response_json(response)
     except requests.RequestException as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
 
@@ -721,58 +1198,53 @@ def reverse_geocode(lat: float, lon: float):
     }
 
 
-# Returns handoff requests for the queue.
-@app.get("/api/handoff/requests")
-def list_handoff_requests(status: Optional[str] = Query(default=None)):
-    with get_connection() as conn:
+HANDOFF_LIST_SQL = """
+    SELECT hr.id, hr.conversation_id, hr.created_at, hr.status,
+           hr.risk_score, hr.crisis_type, hr.user_status, hr.user_channel,
+           hr.summary_json, hr.assigned_to,
+           hm.id AS last_message_id, hm.sender AS last_message_sender,
+           hm.created_at AS last_message_at
+    FROM (
+        SELECT *
+        FROM handoff_requests hr
+        WHERE {where}
+        ORDER BY hr.created_at DESC, hr.id DESC
+        LIMIT %s
+    ) hr
+    LEFT JOIN LATERAL (
+        SELECT id, sender, created_at
+        FROM handoff_messages
+        WHERE request_id = hr.id
+        ORDER BY id DESC
+        LIMIT 1
+    ) hm ON true
+    ORDER BY hr.created_at DESC, hr.id DESC
+"""
+
+
+# Runs one page of the handoff queue query and returns the response payload.
+def _query_handoff_page(
+    where: str,
+    params: tuple,
+    limit: int,
+    cursor_ts: Optional[datetime],
+    cursor_id: Optional[int],
+):
+    if (cursor_ts is None) != (cursor_id is None):
+        raise HTTPException(status_code=400, detail="cursor_ts and cursor_id go together")
+    if cursor_ts is not None:
+        where = f"{where} AND (hr.created_at, hr.id) < (%s, %s)"
+        params = params + (cursor_ts, cursor_id)
+    with get_readonly_connection() as conn:
         with conn.cursor() as cur:
-            if status:
-                cur.execute(
-                    """
-                    SELECT hr.id, hr.conversation_id, hr.created_at, hr.status,
-                           hr.risk_score, hr.crisis_type, hr.user_status, hr.user_channel,
-                           hr.summary_json, hr.assigned_to,
-                           hm.id AS last_message_id, hm.sender AS last_message_sender,
-                           hm.created_at AS last_message_at
-                    FROM handoff_requests hr
-                    LEFT JOIN LATERAL (
-                        SELECT id, sender, created_at
-                        FROM handoff_messages
-                        WHERE request_id = hr.id
-                        ORDER BY id DESC
-                        LIMIT 1
-                    ) hm ON true
-                    WHERE hr.status = %s
-                    ORDER BY hr.created_at DESC
-                    """,
-                    (status,),
-                )
-            else:
-                cur.execute(
-                    """
-                    SELECT hr.id, hr.conversation_id, hr.created_at, hr.status,
-                           hr.risk_score, hr.crisis_type, hr.user_status, hr.user_channel,
-                           hr.summary_json, hr.assigned_to,
-                           hm.id AS last_message_id, hm.sender AS last_message_sender,
-                           hm.created_at AS last_message_at
-                    FROM handoff_requests hr
-                    LEFT JOIN LATERAL (
-                        SELECT id, sender, created_at
-                        FROM handoff_messages
-                        WHERE request_id = hr.id
-                        ORDER BY id DESC
-                        LIMIT 1
-                    ) hm ON true
-                    ORDER BY hr.created_at DESC
-                    """
-                )
+            cur.execute(HANDOFF_LIST_SQL.format(where=where), params + (limit,))
             rows = cur.fetchall()
 
     items = [
         {
             "id": row[0],
             "conversation_id": row[1],
-            "created_at": row[2].isoformat() if row[2] else None,
+            "created_at": row[2],
             "status": row[3],
             "risk_score": row[4],
             "crisis_type": row[5],
@@ -782,66 +1254,51 @@ def list_handoff_requests(status: Optional[str] = Query(default=None)):
             "assigned_to": row[9],
             "last_message_id": row[10],
             "last_message_sender": row[11],
-            "last_message_at": row[12].isoformat() if row[12] else None,
+            "last_message_at": row[12],
         }
         for row in rows
     ]
-    return {"requests": items}
+    next_cursor = None
+    if len(rows) == limit:
+        next_cursor = {"cursor_ts": rows[-1][2], "cursor_id": rows[-1][0]}
+    return _json_response({"requests": items, "next_cursor": next_cursor})
+
+
+# Returns handoff requests for the queue.
+@app.get("/api/handoff/requests")
+def list_handoff_requests(
+    status: Optional[str] = Query(default=None),
+    limit: int = Query(default=HANDOFF_PAGE_SIZE, ge=1, le=HANDOFF_PAGE_MAX),
+    cursor_ts: Optional[datetime] = Query(default=None),
+    cursor_id: Optional[int] = Query(default=None),
+):
+    if status:
+        return _query_handoff_page("hr.status = %s", (status,), limit, cursor_ts, cursor_id)
+    return _query_handoff_page("true", (), limit, cursor_ts, cursor_id)
 
 
 # Returns handoff requests filtered by role.
 @app.get("/api/admin/handoff/requests")
 def admin_list_handoff_requests(
     status: Optional[str] = Query(default=None),
+    limit: int = Query(default=HANDOFF_PAGE_SIZE, ge=1, le=HANDOFF_PAGE_MAX),
+    cursor_ts: Optional[datetime] = Query(default=None),
+    cursor_id: Optional[int] = Query(default=None),
     authorization: Optional[str] = Header(default=None),
 ):
     info = _require_auth(authorization, roles={"admin", "operator"})
     if info.get("user_type") == "operator":
-        with get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    SELECT hr.id, hr.conversation_id, hr.created_at, hr.status,
-                           hr.risk_score, hr.crisis_type, hr.user_status, hr.user_channel,
-                           hr.summary_json, hr.assigned_to,
-                           hm.id AS last_message_id, hm.sender AS last_message_sender,
-                           hm.created_at AS last_message_at
-                    FROM handoff_requests hr
-                    LEFT JOIN LATERAL (
-                        SELECT id, sender, created_at
-                        FROM handoff_messages
-                        WHERE request_id = hr.id
-                        ORDER BY id DESC
-                        LIMIT 1
-                    ) hm ON true
-                    WHERE hr.status IN ('open', 'assigned')
-                      AND (hr.status = 'open' OR hr.assigned_to = %s)
-                    ORDER BY hr.created_at DESC
-                    """,
-                    (info.get("username"),),
-                )
-                rows = cur.fetchall()
-        items = [
-            {
-                "id": row[0],
-                "conversation_id": row[1],
-                "created_at": row[2].isoformat() if row[2] else None,
-                "status": row[3],
-                "risk_score": row[4],
-                "crisis_type": row[5],
-                "user_status": row[6],
-                "user_channel": row[7],
-                "summary_json": row[8],
-                "assigned_to": row[9],
-                "last_message_id": row[10],
-                "last_message_sender": row[11],
-                "last_message_at": row[12].isoformat() if row[12] else None,
-            }
-            for row in rows
-        ]
-        return {"requests": items}
+        return _query_handoff_page(
+            "hr.status IN ('open', 'assigned') AND (hr.status = 'open' OR hr.assigned_to = %s)",
+            (info.get("username"),),
+            limit,
+            cursor_ts,
+            cursor_id,
+        )
 
-    return list_handoff_requests(status=status)
+    return list_handoff_requests(
+        status=status, limit=limit, cursor_ts=cursor_ts, cursor_id=cursor_id
+    )
 
 
 # Returns the active handoff request for a conversation.
@@ -886,11 +1343,11 @@ def list_handoff_messages(request_id: int, after_id: int = 0):
             "id": row[0],
             "sender": row[1],
             "text": row[2],
-            "created_at": row[3].isoformat() if row[3] else None,
+            "created_at": row[3],
         }
         for row in rows
     ]
-    return {"messages": items}
+    return _json_response({"messages": items})
 
 
 # Admin wrapper that returns handoff messages.
@@ -935,6 +1392,24 @@ def create_handoff_message(payload: HandoffMessageRequest):
     return {"id": message_id}
 
 
+# Claims an unassigned, non-closed request for the operator and posts the join message
+# in one round trip; the outer SELECT sees the pre-claim row.
+HANDOFF_CLAIM_SQL = """
+    WITH claim AS (
+        UPDATE handoff_requests
+        SET status = 'assigned', assigned_to = %(username)s
+        WHERE id = %(request_id)s AND assigned_to IS NULL AND status <> 'closed'
+        RETURNING assigned_to
+    ), joined AS (
+        INSERT INTO handoff_messages (request_id, sender, text)
+        SELECT %(request_id)s, 'system', %(joined_text)s FROM claim
+    )
+    SELECT (SELECT assigned_to FROM claim), hr.assigned_to
+    FROM handoff_requests hr
+    WHERE hr.id = %(request_id)s
+"""
+
+
 # Creates a message with admin checks and returns its id.
 @app.post("/api/admin/handoff/messages")
 def admin_create_handoff_message(
@@ -942,40 +1417,23 @@ def admin_create_handoff_message(
     authorization: Optional[str] = Header(default=None),
 ):
     info = _require_auth(authorization, roles={"admin", "operator"})
-    with get_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute(
-                "SELECT assigned_to, status FROM handoff_requests WHERE id = %s",
-                (payload.request_id,),
-            )
-            row = cur.fetchone()
-            assigned_to = row[0] if row else None
-            status = row[1] if row else None
-            assigned_now = False
-            if payload.sender == "agent" and not assigned_to and status != "closed":
+    assigned_to = None
+    if payload.sender == "agent":
+        username = info.get("username")
+        with get_connection() as conn:
+            with conn.cursor() as cur:
                 cur.execute(
-                    """
-                    UPDATE handoff_requests
-                    SET status = 'assigned', assigned_to = %s
-                    WHERE id = %s AND assigned_to IS NULL
-                    """,
-                    (info.get("username"), payload.request_id),
+                    HANDOFF_CLAIM_SQL,
+                    {
+                        "request_id": payload.request_id,
+                        "username": username,
+                        "joined_text": f"Operator {username} joined the chat.",
+                    },
                 )
-                assigned_now = cur.rowcount > 0
-                if assigned_now:
-                    assigned_to = info.get("username")
-                    status = "assigned"
-                    cur.execute(
-                        """
-                        INSERT INTO handoff_messages (request_id, sender, text)
-                        VALUES (%s, %s, %s)
-                        """,
-                        (
-                            payload.request_id,
-                            "system",
-                            f"Operator {assigned_to} joined the chat.",
-                        ),
-                    )
+                row = cur.fetchone()
+        if row:
+            claimed_by, current_assignee = row
+            assigned_to = claimed_by or current_assignee
     if (
         payload.sender == "agent"
         and assigned_to
@@ -1022,7 +1480,9 @@ def admin_update_handoff_status(
     assigned_to = None
     if status == "assigned":
         assigned_to = info.get("username")
-    with get_connection() as conn:
+
+    # Reads and updates on one snapshot; a concurrent change makes the UPDATE fail and retry.
+    def apply(conn) -> None:
         with conn.cursor() as cur:
             cur.execute(
                 "SELECT status, assigned_to FROM handoff_requests WHERE id = %s",
@@ -1057,6 +1517,8 @@ def admin_update_handoff_status(
                     "UPDATE handoff_requests SET status = %s WHERE id = %s",
                     (status, request_id),
                 )
+
+    run_transaction(apply, isolation_level=ISOLATION_LEVEL_REPEATABLE_READ)
     return {"ok": True}
 
 
@@ -1069,6 +1531,15 @@ def list_admin_tables(authorization: Optional[str] = Header(default=None)):
     return {"tables": sorted(ADMIN_TABLES)}
 
 
+# Drops cached table metadata after a schema change and returns ok.
+@app.post("/api/admin/reload-schema")
+def admin_reload_schema(authorization: Optional[str] = Header(default=None)):
+    _require_auth(authorization, roles={"admin"})
+    with TABLE_META_LOCK:
+        TABLE_META_CACHE.clear()
+    return {"ok": True}
+
+
 # Returns table metadata and rows for admin.
 @app.get("/api/admin/table/{table_name}")
 def get_admin_table(
@@ -1082,15 +1553,11 @@ def get_admin_table(
     if table_name not in allowed:
         raise HTTPException(status_code=404, detail="Table not allowed")
 
-    with get_connection() as conn:
+    with get_readonly_connection() as conn:
         with conn.cursor() as cur:
-            columns_meta, primary_key = _fetch_table_meta(cur, table_name)
+            columns_meta, primary_key = _get_table_meta(cur, table_name)
             columns = [col["name"] for col in columns_meta]
-            query = sql.SQL("SELECT {fields} FROM {table} LIMIT %s OFFSET %s").format(
-                fields=sql.SQL(", ").join(map(sql.Identifier, columns)),
-                table=sql.Identifier(table_name),
-            )
-            cur.execute(query, (limit, offset))
+            cur.execute(_select_query(table_name, tuple(columns)), (limit, offset))
             rows = cur.fetchall()
 
     return {
@@ -1100,6 +1567,87 @@ def get_admin_table(
     }
 
 
+# Builds the paged SELECT for an admin table and returns it (cached per column set).
+@functools.lru_cache(maxsize=512)
+def _select_query(table: str, columns: tuple) -> sql.Composed:
+    return sql.SQL("SELECT {fields} FROM {table} LIMIT %s OFFSET %s").format(
+        fields=sql.SQL(", ").join(map(sql.Identifier, columns)),
+        table=sql.Identifier(table),
+    )
+
+
+# Builds the multi-row INSERT for execute_values and returns it (cached per column set).
+@functools.lru_cache(maxsize=512)
+def _insert_query(table: str, columns: tuple) -> sql.Composed:
+    return sql.SQL("INSERT INTO {table} ({fields}) VALUES %s").format(
+        table=sql.Identifier(table),
+        fields=sql.SQL(", ").join(map(sql.Identifier, columns)),
+    )
+
+
+# Builds the single-row UPDATE (with the protected-user guard on users) and returns it.
+@functools.lru_cache(maxsize=512)
+def _update_query(table: str, columns: tuple, primary_key: str) -> sql.Composed:
+    assignments = [
+        sql.SQL("{} = {}").format(sql.Identifier(col), sql.Placeholder())
+        for col in columns
+    ]
+    if table == "supply_points":
+        assignments.append(sql.SQL("updated_at = now()"))
+    query = sql.SQL("UPDATE {table} SET {assignments} WHERE {pk} = %s").format(
+        table=sql.Identifier(table),
+        assignments=sql.SQL(", ").join(assignments),
+        pk=sql.Identifier(primary_key),
+    )
+    if table == "users":
+        query = sql.SQL("{} AND username <> %s RETURNING 1").format(query)
+    return query
+
+
+# Builds the single-row DELETE (with the protected-user guard on users) and returns it.
+@functools.lru_cache(maxsize=512)
+def _delete_query(table: str, primary_key: str) -> sql.Composed:
+    query = sql.SQL("DELETE FROM {table} WHERE {pk} = %s").format(
+        table=sql.Identifier(table),
+        pk=sql.Identifier(primary_key),
+    )
+    if table == "users":
+        query = sql.SQL("{} AND username <> %s RETURNING 1").format(query)
+    return query
+
+
+# Hashes a plain password field for the users table and returns the row data.
+def _prepare_admin_data(table_name: str, data: dict) -> dict:
+    data = dict(data or {})
+    if table_name == "users" and "password" in data:
+        data["password_hash"] = _hash_password(str(data.pop("password")))
+    return data
+
+
+# Keeps only the insertable table columns of a row and returns them in table order.
+def _prepare_insert(data: dict, columns: List[str], primary_key: Optional[str]) -> dict:
+    values = {col: data[col] for col in columns if col in data and col != primary_key}
+    if not values:
+        raise HTTPException(status_code=400, detail="No valid columns")
+    return values
+
+
+# Inserts rows with one multi-row INSERT per column set and returns the inserted count.
+def _insert_admin_rows(table_name: str, rows: List[dict]) -> int:
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            columns_meta, primary_key = _get_table_meta(cur, table_name)
+            columns = [col["name"] for col in columns_meta]
+            groups = {}
+            for data in rows:
+                values = _prepare_insert(data, columns, primary_key)
+                groups.setdefault(tuple(values), []).append(tuple(values.values()))
+
+            for insert_columns, group in groups.items():
+                execute_values(cur, _insert_query(table_name, insert_columns), group, page_size=500)
+    return len(rows)
+
+
 # Creates a row in the selected table and returns ok.
 @app.post("/api/admin/table/{table_name}")
 def create_admin_row(
@@ -1112,28 +1660,26 @@ def create_admin_row(
     if table_name not in allowed:
         raise HTTPException(status_code=404, detail="Table not allowed")
 
-    data = dict(payload.data or {})
-    if table_name == "users" and "password" in data:
-        data["password_hash"] = _hash_password(str(data.pop("password")))
+    _insert_admin_rows(table_name, [_prepare_admin_data(table_name, payload.data)])
+    return {"ok": True}
 
-    with get_connection() as conn:
-        with conn.cursor() as cur:
-            columns_meta, primary_key = _fetch_table_meta(cur, table_name)
-            columns = [col["name"] for col in columns_meta]
-            if primary_key in data:
-                data.pop(primary_key, None)
-            insert_columns = [key for key in data.keys() if key in columns]
-            if not insert_columns:
-                raise HTTPException(status_code=400, detail="No valid columns")
 
-            query = sql.SQL("INSERT INTO {table} ({fields}) VALUES ({values})").format(
-                table=sql.Identifier(table_name),
-                fields=sql.SQL(", ").join(map(sql.Identifier, insert_columns)),
-                values=sql.SQL(", ").join(sql.Placeholder() for _ in insert_columns),
-            )
-            cur.execute(query, [data[key] for key in insert_columns])
+# Creates many rows in the selected table and returns the inserted count.
+@app.post("/api/admin/table/{table_name}/bulk")
+def create_admin_rows(
+    table_name: str,
+    payload: AdminTableBulkPayload,
+    authorization: Optional[str] = Header(default=None),
+):
+    info = _require_auth(authorization, roles={"admin", "operator"})
+    allowed = ADMIN_TABLES if info.get("user_type") == "admin" else OPERATOR_TABLES
+    if table_name not in allowed:
+        raise HTTPException(status_code=404, detail="Table not allowed")
+    if not payload.rows:
+        raise HTTPException(status_code=400, detail="No rows")
 
-    return {"ok": True}
+    rows = [_prepare_admin_data(table_name, data) for data in payload.rows]
+    return {"ok": True, "inserted": _insert_admin_rows(table_name, rows)}
 
 
 # Updates a table row and returns ok.
@@ -1149,24 +1695,11 @@ def update_admin_row(
     if table_name not in allowed:
         raise HTTPException(status_code=404, detail="Table not allowed")
 
-    data = dict(payload.data or {})
-    if table_name == "users" and "password" in data:
-        data["password_hash"] = _hash_password(str(data.pop("password")))
+    data = _prepare_admin_data(table_name, payload.data)
 
     with get_connection() as conn:
         with conn.cursor() as cur:
-            if table_name == "users":
-                cur.execute(
-                    "SELECT username FROM users WHERE id = %s",
-                    (row_id,),
-                )
-                row = cur.fetchone()
-                if row and row[0] == "crisos_admin":
-                    raise HTTPException(
-                        status_code=403,
-                        detail="Protected user cannot be edited",
-                    )
-            columns_meta, primary_key = _fetch_table_meta(cur, table_name)
+            columns_meta, primary_key = _get_table_meta(cur, table_name)
             if not primary_key:
                 raise HTTPException(status_code=400, detail="No primary key")
             columns = [col["name"] for col in columns_meta]
@@ -1175,19 +1708,12 @@ def update_admin_row(
             if not update_columns:
                 raise HTTPException(status_code=400, detail="No valid columns")
 
-            assignments = [
-                sql.SQL("{} = {}").format(sql.Identifier(col), sql.Placeholder())
-                for col in update_columns
-            ]
-            if table_name == "supply_points":
-                assignments.append(sql.SQL("updated_at = now()"))
-            assignments_sql = sql.SQL(", ").join(assignments)
-            query = sql.SQL("UPDATE {table} SET {assignments} WHERE {pk} = %s").format(
-                table=sql.Identifier(table_name),
-                assignments=assignments_sql,
-                pk=sql.Identifier(primary_key),
-            )
-            cur.execute(query, [data[col] for col in update_columns] + [row_id])
+            params = [data[col] for col in update_columns] + [row_id]
+            if table_name == "users":
+                params.append(PROTECTED_USERNAME)
+            cur.execute(_update_query(table_name, tuple(update_columns), primary_key), params)
+            if table_name == "users" and cur.fetchone() is None:
+                _reject_protected_user(cur, row_id, "Protected user cannot be edited")
 
     return {"ok": True}
 
@@ -1206,25 +1732,16 @@ def delete_admin_row(
 
     with get_connection() as conn:
         with conn.cursor() as cur:
-            if table_name == "users":
-                cur.execute(
-                    "SELECT username FROM users WHERE id = %s",
-                    (row_id,),
-                )
-                row = cur.fetchone()
-                if row and row[0] == "crisos_admin":
-                    raise HTTPException(
-                        status_code=403,
-                        detail="Protected user cannot be deleted",
-                    )
-            _, primary_key = _fetch_table_meta(cur, table_name)
+            _, primary_key = _get_table_meta(cur, table_name)
             if not primary_key:
                 raise HTTPException(status_code=400, detail="No primary key")
-            query = sql.SQL("DELETE FROM {table} WHERE {pk} = %s").format(
-                table=sql.Identifier(table_name),
-                pk=sql.Identifier(primary_key),
-            )
-            cur.execute(query, (row_id,))
+            query = _delete_query(table_name, primary_key)
+            if table_name == "users":
+                cur.execute(query, (row_id, PROTECTED_USERNAME))
+                if cur.fetchone() is None:
+                    _reject_protected_user(cur, row_id, "Protected user cannot be deleted")
+            else:
+                cur.execute(query, (row_id,))
 
     return {"ok": True}
 
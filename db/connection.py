@@ -1,6 +1,14 @@
+import functools
 import os
+import re
+import threading
+import time
+import weakref
+from contextlib import contextmanager
 from pathlib import Path
 import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_REPEATABLE_READ, TransactionRollbackError
+from psycopg2.pool import ThreadedConnectionPool
 
 
 def _load_env_file(path: Path) -> None:
@@ -31,6 +39,165 @@ def get_db_config():
     }
 
 
-def get_connection():
-    """Create a new psycopg2 connection using env-based config."""
+def create_connection():
+    """Create a new, unpooled psycopg2 connection using env-based config."""
     return psycopg2.connect(**get_db_config())
+
+
+# PgBouncer in transaction mode hands each transaction a different server connection,
+# so session-level PREPARE statements must be turned off behind it.
+SERVER_PREPARE = os.getenv("DB_SERVER_PREPARE", "true").lower() not in {"0", "false", "no"}
+POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN", "1"))
+POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX", "16"))
+# TCP keepalives let the OS notice dead pooled connections without a per-checkout ping.
+POOL_KEEPALIVES = {
+    "keepalives": 1,
+    "keepalives_idle": 30,
+    "keepalives_interval": 10,
+    "keepalives_count": 3,
+}
+
+_POOL = None
+_POOL_PID = None
+_POOL_SLOTS = threading.BoundedSemaphore(POOL_MAX_SIZE)
+_POOL_LOCK = threading.Lock()
+
+
+def _get_pool():
+    """Return the process-wide connection pool, creating it on first use (and after fork)."""
+    global _POOL, _POOL_PID
+    pid = os.getpid()
+    if _POOL is not None and _POOL_PID == pid:
+        return _POOL
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_PID != pid:
+            _POOL = ThreadedConnectionPool(
+                POOL_MIN_SIZE, POOL_MAX_SIZE, **get_db_config(), **POOL_KEEPALIVES
+            )
+            _POOL_PID = pid
+    return _POOL
+
+
+@contextmanager
+def get_connection(isolation_level=None, readonly=False):
+    """Borrow a pooled connection for one transaction.
+
+    Commits on success and rolls back on error, like ``with psycopg2.connect() as conn``,
+    then returns the connection to the pool. Waits when all connections are in use.
+    ``isolation_level`` (a ``psycopg2.extensions.ISOLATION_LEVEL_*`` value) and ``readonly``
+    apply to this transaction only.
+    """
+    with _POOL_SLOTS:
+        pool = _get_pool()
+        conn = pool.getconn()
+        if conn.closed:
+            pool.putconn(conn, close=True)
+            conn = pool.getconn()
+        broken = False
+        custom_session = isolation_level is not None or readonly
+        try:
+            if custom_session:
+                conn.set_session(isolation_level=isolation_level, readonly=readonly or None)
+            with conn:
+                yield conn
+        except TransactionRollbackError:
+            raise
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            raise
+        finally:
+            if custom_session and not (broken or conn.closed):
+                try:
+                    conn.set_session(isolation_level="DEFAULT", readonly="DEFAULT")
+                except psycopg2.Error:
+                    broken = True
+            pool.putconn(conn, close=broken or bool(conn.closed))
+
+
+def get_readonly_connection():
+    """Borrow a pooled connection for one READ ONLY, REPEATABLE READ transaction.
+
+    Read-only transactions skip SSI predicate-lock bookkeeping and see one consistent snapshot.
+    """
+    return get_connection(isolation_level=ISOLATION_LEVEL_REPEATABLE_READ, readonly=True)
+
+
+def run_transaction(work, isolation_level=None, attempts=3):
+    """Run ``work(conn)`` in one pooled transaction and return its result.
+
+    Serialization failures and deadlocks roll the transaction back and re-run ``work``
+    with exponential backoff, up to ``attempts`` times.
+    """
+    for attempt in range(attempts):
+        try:
+            with get_connection(isolation_level=isolation_level) as conn:
+                return work(conn)
+        except TransactionRollbackError:
+            if attempt == attempts - 1:
+                raise
+            time.sleep(0.05 * 2 ** attempt)
+
+
+def warm_pool():
+    """Open the pool's minimum connections and round-trip ``SELECT 1`` on each."""
+    pool = _get_pool()
+    conns = [pool.getconn() for _ in range(POOL_MIN_SIZE)]
+    try:
+        for conn in conns:
+            with conn:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+    finally:
+        for conn in conns:
+            pool.putconn(conn, close=bool(conn.closed))
+
+
+def close_pool():
+    """Close every pooled connection; the next ``get_connection()`` opens a fresh pool."""
+    global _POOL, _POOL_PID
+    with _POOL_LOCK:
+        if _POOL is not None and _POOL_PID == os.getpid():
+            _POOL.closeall()
+        _POOL = None
+        _POOL_PID = None
+
+
+_PREPARED = weakref.WeakKeyDictionary()
+_PREPARED_LOCK = threading.Lock()
+
+
+_PLACEHOLDER_RE = re.compile(r"\$(\d+)")
+
+
+@functools.lru_cache(maxsize=64)
+def _inline_statement(statement):
+    """Rewrite ``$n`` placeholders as ``%s`` and return the query with its parameter order."""
+    order = tuple(int(num) - 1 for num in _PLACEHOLDER_RE.findall(statement))
+    if not order:
+        return statement, order
+    return _PLACEHOLDER_RE.sub("%s", statement.replace("%", "%%")), order
+
+
+def execute_prepared(cur, name, statement, params):
+    """Execute a named server-side prepared statement, preparing it once per connection.
+
+    ``statement`` uses PostgreSQL ``$1, $2, ...`` placeholders. With ``DB_SERVER_PREPARE``
+    off (e.g. behind PgBouncer in transaction mode) it runs as a plain parameterized query.
+    """
+    if not SERVER_PREPARE:
+        query, order = _inline_statement(statement)
+        cur.execute(query, [params[index] for index in order] if order else None)
+        return
+    conn = cur.connection
+    with _PREPARED_LOCK:
+        prepared = _PREPARED.setdefault(conn, set())
+        needs_prepare = name not in prepared
+    if needs_prepare:
+        cur.execute(f"PREPARE {name} AS {statement}")
+        with _PREPARED_LOCK:
+            prepared.add(name)
+    if not params:
+        cur.execute(f"EXECUTE {name}")
+        return
+    placeholders = ", ".join(["%s"] * len(params))
+    cur.execute(f"EXECUTE {name} ({placeholders})", params)
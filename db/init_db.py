@@ -3,9 +3,23 @@ import os
 import re
 
 try:
-    from db.connection import get_connection
+    from db.connection import create_connection
 except ImportError:
-    from connection import get_connection
+    from connection import create_connection
+
+try:
+    from argon2 import PasswordHasher
+except ImportError:
+    PasswordHasher = None
+
+PARENS_RE = re.compile(r"\s*\(.*?\)\s*")
+WHITESPACE_RE = re.compile(r"\s+")
+LEGACY_PASSWORD_HASH_RE = re.compile(r"^[0-9a-f]{64}$")
+PASSWORD_HASHER = (
+    PasswordHasher(time_cost=2, memory_cost=64_000, parallelism=1)
+    if PasswordHasher is not None
+    else None
+)
 
 DDL_SQL = """
 DO $$
@@ -116,8 +130,11 @@ CREATE TABLE IF NOT EXISTS handoff_requests (
 
 CREATE INDEX IF NOT EXISTS idx_handoff_requests_conversation
   ON handoff_requests (conversation_id);
-CREATE INDEX IF NOT EXISTS idx_handoff_requests_status
-  ON handoff_requests (status);
+DROP INDEX IF EXISTS idx_handoff_requests_status;
+CREATE INDEX IF NOT EXISTS idx_handoff_requests_status_created
+  ON handoff_requests (status, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_handoff_requests_created
+  ON handoff_requests (created_at DESC, id DESC);
 
 CREATE TABLE IF NOT EXISTS handoff_messages (
   id BIGSERIAL PRIMARY KEY,
@@ -132,18 +149,20 @@ ALTER TABLE handoff_requests ADD COLUMN IF NOT EXISTS assigned_to TEXT;
 
 CREATE INDEX IF NOT EXISTS idx_handoff_messages_request
   ON handoff_messages (request_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_handoff_messages_last
+  ON handoff_messages (request_id, id DESC);
 """
 
 
 def get_conn():
-    return get_connection()
+    return create_connection()
 
 
 def normalize_name(value):
     if not value:
         return ""
     text = str(value).strip()
-    text = re.sub(r"\s*\(.*?\)\s*", "", text)
+    text = PARENS_RE.sub("", text)
     replacements = {
         "\u00e4": "a",
         "\u00c4": "A",
@@ -155,16 +174,22 @@ def normalize_name(value):
     }
     for src, dst in replacements.items():
         text = text.replace(src, dst)
-    text = re.sub(r"\s+", " ", text).strip()
+    text = WHITESPACE_RE.sub(" ", text).strip()
     return text
 
 
-def hash_password(password: str) -> str:
+def legacy_hash_password(password: str) -> str:
     salt = os.getenv("ADMIN_PASSWORD_SALT", "crisis_salt")
     value = f"{salt}:{password}".encode("utf-8")
     return hashlib.sha256(value).hexdigest()
 
 
+def hash_password(password: str) -> str:
+    if PASSWORD_HASHER is not None:
+        return PASSWORD_HASHER.hash(password)
+    return legacy_hash_password(password)
+
+
 def upsert_supply_point(cur, city_name, category, name, address,
                         description=None, phone=None):
     city_name = normalize_name(city_name)
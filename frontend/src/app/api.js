@@ -95,11 +95,16 @@ export async function adminLogin(payload) {
   return response.json();
 }
 
-export async function adminListHandoffRequests(token, status) {
+export async function adminListHandoffRequests(token, status, cursor = null, limit = 50) {
   const url = new URL(`${API_BASE_URL}/api/admin/handoff/requests`);
   if (status) {
     url.searchParams.set("status", status);
   }
+  url.searchParams.set("limit", String(limit));
+  if (cursor) {
+    url.searchParams.set("cursor_ts", cursor.cursor_ts);
+    url.searchParams.set("cursor_id", String(cursor.cursor_id));
+  }
   const response = await fetch(url, {
     headers: { Authorization: `Bearer ${token}` },
   });
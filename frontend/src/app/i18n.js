@@ -143,6 +143,7 @@ const resources = {
       admin: {
         queue: "Handover Queue",
         empty: "No active handovers.",
+        loadOlder: "Load older handovers",
         select: "Select a handover",
         conversation: "Conversation",
         noConversation: "No active conversation",
@@ -303,6 +304,7 @@ const resources = {
       admin: {
         queue: "Handover-Liste",
         empty: "Keine aktiven Ubergaben.",
+        loadOlder: "Altere Ubergaben laden",
         select: "Ubergabe auswahlen",
         conversation: "Gesprache",
         noConversation: "Kein aktives Gesprach",
@@ -463,6 +465,7 @@ const resources = {
       admin: {
         queue: "Handover Sirasi",
         empty: "Aktif handover yok.",
+        loadOlder: "Eski handoverlari yukle",
         select: "Handover secin",
         conversation: "Gorusme",
         noConversation: "Aktif gorusme yok",
@@ -1,5 +1,5 @@
 import { Dialog, Menu } from "@headlessui/react";
-import { useEffect, useMemo, useState } from "react";
+import { useEffect, useMemo, useRef, useState } from "react";
 import { useTranslation } from "react-i18next";
 import {
   adminGetHandoffMessages,
@@ -60,6 +60,13 @@ const riskLabel = (value, userStatus) => {
   return "Low";
 };
 
+// True when a request sorts after the (created_at, id) cursor in the newest-first queue.
+const isBeforeCursor = (request, cursor) => {
+  const created = Date.parse(request.created_at);
+  const boundary = Date.parse(cursor.cursor_ts);
+  return created < boundary || (created === boundary && request.id < cursor.cursor_id);
+};
+
 const parseSummary = (raw) => {
   if (!raw) return null;
   if (typeof raw === "string") {
@@ -242,6 +249,10 @@ export default function AdminPanel() {
   const [draft, setDraft] = useState("");
   const [activePage, setActivePage] = useState("handover");
   const [queueUpdatedAt, setQueueUpdatedAt] = useState(null);
+  const [queueCursor, setQueueCursor] = useState(null);
+  const [loadingOlder, setLoadingOlder] = useState(false);
+  const queuePollInFlight = useRef(false);
+  const olderPagesLoaded = useRef(false);
   const [summaryAddresses, setSummaryAddresses] = useState({});
   const [navCollapsed, setNavCollapsed] = useState(false);
   const [alerts, setAlerts] = useState([]);
@@ -338,14 +349,40 @@ export default function AdminPanel() {
   useEffect(() => {
     if (!token) return;
     let active = true;
-    const load = () =>
+    olderPagesLoaded.current = false;
+    queuePollInFlight.current = false;
+    // Polls only the newest page; older pages are fetched on demand via loadOlderRequests.
+    const load = () => {
+      if (queuePollInFlight.current) return;
+      queuePollInFlight.current = true;
       adminListHandoffRequests(token)
         .then((data) => {
           if (!active) return;
-          setRequests(data.requests || []);
+          const page = data.requests || [];
+          const boundary = data.next_cursor || null;
+          if (!boundary) {
+            olderPagesLoaded.current = false;
+          }
+          setRequests((prev) => {
+            if (!boundary || !olderPagesLoaded.current) return page;
+            const pageIds = new Set(page.map((item) => item.id));
+            return [
+              ...page,
+              ...prev.filter(
+                (item) => !pageIds.has(item.id) && isBeforeCursor(item, boundary)
+              ),
+            ];
+          });
+          if (!olderPagesLoaded.current) {
+            setQueueCursor(boundary);
+          }
           setQueueUpdatedAt(new Date());
         })
-        .catch(() => null);
+        .catch(() => null)
+        .finally(() => {
+          queuePollInFlight.current = false;
+        });
+    };
     load();
     const interval = setInterval(load, 5000);
     return () => {
@@ -396,6 +433,25 @@ export default function AdminPanel() {
     return () => clearInterval(interval);
   }, [selectedId, lastMessageId, token]);
 
+  const loadOlderRequests = () => {
+    if (!token || !queueCursor || loadingOlder) return;
+    setLoadingOlder(true);
+    adminListHandoffRequests(token, undefined, queueCursor)
+      .then((data) => {
+        olderPagesLoaded.current = true;
+        setRequests((prev) => {
+          const known = new Set(prev.map((item) => item.id));
+          return [
+            ...prev,
+            ...(data.requests || []).filter((item) => !known.has(item.id)),
+          ];
+        });
+        setQueueCursor(data.next_cursor || null);
+      })
+      .catch(() => null)
+      .finally(() => setLoadingOlder(false));
+  };
+
   const selectedRequest = useMemo(
     () => requests.find((request) => request.id === selectedId),
     [requests, selectedId]
@@ -731,6 +787,16 @@ export default function AdminPanel() {
                     </button>
                   );
                 })}
+                {queueCursor ? (
+                  <button
+                    type="button"
+                    onClick={loadOlderRequests}
+                    disabled={loadingOlder}
+                    className="rounded-2xl border border-clay/60 px-3 py-2 text-xs font-semibold text-ash transition hover:text-ink disabled:opacity-60"
+                  >
+                    {t("admin.loadOlder")}
+                  </button>
+                ) : null}
               </div>
               <div className="mt-auto border-t border-clay/60 pt-3 text-[10px] text-ash">
                 Updated{" "}